@@ -1,13 +1,26 @@
-import os, re, secrets, string, smtplib, requests
+import os, re, time, secrets, string, smtplib, requests
 from email.message import EmailMessage
 from urllib.parse import urlparse
 from datetime import datetime, timedelta, timezone
-from flask import Flask, render_template, request, redirect, url_for, session, flash, abort, g
-from pymongo import MongoClient, ASCENDING, DESCENDING
+from flask import Flask, Response, make_response, render_template, request, redirect, url_for, session, flash, abort, g, stream_with_context, has_request_context
+from pymongo import MongoClient, ASCENDING, DESCENDING, UpdateOne
+from pymongo.errors import PyMongoError
 from bson.objectid import ObjectId
 from werkzeug.security import generate_password_hash, check_password_hash
 from dotenv import load_dotenv
 from utils.otp import make_otp
+from utils.db import ReadRouter
+from utils.repo import (find_rows, find_row, AlumniRow, AdminAlumniRow, ProfileRow, EventRow,
+                        AdminEventRow, AdminBlogRow, BlogRow, BlogSummaryRow)
+from utils.cache import TTLCache, CacheBus
+from utils.chat import ChatMemory
+from utils.rsvp import RSVPBook
+from utils.notify import Notifier, CADENCES, DEFAULT_CADENCE
+from utils.resilience import Breaker, Unavailable
+from utils.render import render_markdown, RENDER_VERSION
+from utils.tenants import (Tenant, TenantRegistry, TenantCollection, assign_missing,
+                           ensure_indexes as ensure_tenant_indexes)
+from utils.contacts import ContactInbox, ensure_indexes as ensure_contact_indexes
 
 load_dotenv()
 
@@ -19,28 +32,62 @@ if not MONGO_URL:
     raise RuntimeError("MONGO_URL is not set.")
 print("[DB] Using MONGO_URL:", re.sub(r":([^@/]+)@", ":****@", MONGO_URL))
 
-client = MongoClient(MONGO_URL, serverSelectionTimeoutMS=5000)
+client = MongoClient(
+    MONGO_URL,
+    serverSelectionTimeoutMS=5000,
+    connectTimeoutMS=int(os.getenv("MONGO_CONNECT_TIMEOUT_MS", "3000")),
+    socketTimeoutMS=int(os.getenv("MONGO_SOCKET_TIMEOUT_MS", "5000")),
+    maxPoolSize=int(os.getenv("MONGO_MAX_POOL_SIZE", "50")),
+    waitQueueTimeoutMS=int(os.getenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "2000")),
+)
 client.admin.command("ping")
 db = client["campus_circle"]
-users = db.users
-events = db.events
-blogs = db.blogs
-otps = db.otps
-resets = db.resets
-email_changes = db.email_changes
-contacts = db.contacts
+
+def current_tenant_id():
+    return g.tenant.id
+
+def remember_write():
+    if has_request_context():
+        session["_last_write"] = time.time()
+
+users = TenantCollection(db.users, current_tenant_id, remember_write)
+events = TenantCollection(db.events, current_tenant_id, remember_write)
+blogs = TenantCollection(db.blogs, current_tenant_id, remember_write)
+otps = TenantCollection(db.otps, current_tenant_id, remember_write)
+resets = TenantCollection(db.resets, current_tenant_id, remember_write)
+email_changes = TenantCollection(db.email_changes, current_tenant_id, remember_write)
+contacts = TenantCollection(db.contacts, current_tenant_id, remember_write)
+MONGO_MAX_STALENESS = int(os.getenv("MONGO_MAX_STALENESS_SECONDS", "90"))
+reads = ReadRouter(db, max_staleness=MONGO_MAX_STALENESS)
 
 SMTP_HOST = os.getenv("BREVO_SMTP_HOST", "smtp.gmail.com")
 SMTP_PORT = int(os.getenv("BREVO_SMTP_PORT", "587"))
 SMTP_USER = os.getenv("BREVO_SMTP_USER")
 SMTP_PASS = os.getenv("BREVO_SMTP_PASS")
 EMAIL_FROM = os.getenv("EMAIL_FROM", SMTP_USER or "noreply@example.com")
+SMTP_TIMEOUT = float(os.getenv("SMTP_TIMEOUT_SECONDS", "10"))
 
 COLLEGE_EMAIL_DOMAIN = os.getenv("COLLEGE_EMAIL_DOMAIN", "@example.edu").lower()
 ADMIN_PASSWORD = os.getenv("ADMIN_PASSWORD", "change-me")
 ADMIN_NOTIFY_EMAIL = os.getenv("ADMIN_NOTIFY_EMAIL", EMAIL_FROM)
+SITE_URL = os.getenv("SITE_URL", "").rstrip("/")
+if not SITE_URL:
+    print("[notify] SITE_URL is not set; email links use the host each item was published from.")
+DEFAULT_TENANT = Tenant(os.getenv("TENANT_ID", "default"), os.getenv("BRAND_NAME", "Campus Circle"),
+                        base_url=SITE_URL, email_domain=COLLEGE_EMAIL_DOMAIN, notify_email=ADMIN_NOTIFY_EMAIL,
+                        admin_password=ADMIN_PASSWORD, open_registration=not COLLEGE_EMAIL_DOMAIN)
 OLLAMA_HOST = os.getenv("OLLAMA_HOST", "http://localhost:11434")
 OLLAMA_MODEL = os.getenv("OLLAMA_MODEL", "phi3:mini")
+CHAT_CONTEXT_TOKENS = int(os.getenv("CHAT_CONTEXT_TOKENS", "1500"))
+OLLAMA_KEEP_ALIVE = os.getenv("OLLAMA_KEEP_ALIVE", "10m")
+OLLAMA_TIMEOUT = float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "20"))
+NOTIFY_CHUNK_SIZE = int(os.getenv("NOTIFY_CHUNK_SIZE", "50"))
+NOTIFY_PER_MINUTE = int(os.getenv("NOTIFY_PER_MINUTE", "600"))
+CACHE_TTL_SECONDS = int(os.getenv("CACHE_TTL_SECONDS", "60"))
+CACHE_MAX_ENTRIES = int(os.getenv("CACHE_MAX_ENTRIES", "2048"))
+CONTACT_BATCH_SIZE = int(os.getenv("CONTACT_BATCH_SIZE", "50"))
+CONTACT_FLUSH_SECONDS = int(os.getenv("CONTACT_FLUSH_SECONDS", "5"))
+CONTACT_DIGEST_MINUTES = int(os.getenv("CONTACT_DIGEST_MINUTES", "15"))
 
 def utcnow():
     return datetime.now(timezone.utc)
@@ -93,6 +140,10 @@ def safe_url(url):
     except Exception:
         return ""
 
+mongo_breaker = Breaker("mongo", threshold=5, reset_seconds=15, max_concurrent=32, errors=(PyMongoError,))
+smtp_breaker = Breaker("smtp", threshold=3, reset_seconds=60, max_concurrent=4)
+ollama_breaker = Breaker("ollama", threshold=3, reset_seconds=30, max_concurrent=2, wait_seconds=0.1)
+
 def send_mail(to_email, subject, body):
     if not (SMTP_HOST and SMTP_PORT and SMTP_USER and SMTP_PASS):
         return
@@ -101,20 +152,104 @@ def send_mail(to_email, subject, body):
     msg["To"] = to_email
     msg["Subject"] = subject
     msg.set_content(body)
-    with smtplib.SMTP(SMTP_HOST, SMTP_PORT) as s:
+    smtp_breaker.call(_smtp_send, [msg])
+
+def send_mail_batch(messages):
+    if not messages or not (SMTP_HOST and SMTP_PORT and SMTP_USER and SMTP_PASS):
+        return
+    msgs = []
+    for to_email, subject, body in messages:
+        msg = EmailMessage()
+        msg["From"] = EMAIL_FROM
+        msg["To"] = to_email
+        msg["Subject"] = subject
+        msg.set_content(body)
+        msgs.append(msg)
+    smtp_breaker.call(_smtp_send, msgs)
+
+def _smtp_send(msgs):
+    with smtplib.SMTP(SMTP_HOST, SMTP_PORT, timeout=SMTP_TIMEOUT) as s:
         s.starttls()
         s.login(SMTP_USER, SMTP_PASS)
-        s.send_message(msg)
+        for msg in msgs:
+            try:
+                s.send_message(msg)
+            except smtplib.SMTPRecipientsRefused:
+                pass
+
+tenants = TenantRegistry(db.tenants, DEFAULT_TENANT)
+ensure_tenant_indexes(db)
+for name, n in assign_missing(db, DEFAULT_TENANT.id).items():
+    if n:
+        print(f"[tenants] {name}: {n} document(s) assigned to {DEFAULT_TENANT.id}.")
+
+ensure_contact_indexes(db.contacts)
+contact_inbox = ContactInbox(db.contacts, send_mail, tenants.get, db.contact_state,
+                             batch_size=CONTACT_BATCH_SIZE,
+                             flush_seconds=CONTACT_FLUSH_SECONDS,
+                             digest_minutes=CONTACT_DIGEST_MINUTES)
+
+chat_memory = ChatMemory(db, OLLAMA_HOST, OLLAMA_MODEL,
+                         context_tokens=CHAT_CONTEXT_TOKENS, keep_alive=OLLAMA_KEEP_ALIVE,
+                         timeout=OLLAMA_TIMEOUT, call=ollama_breaker.call)
+
+rsvp_book = RSVPBook(db)
+
+# Shared entries are filled from the primary: an invalidation fires on the primary commit, and a
+# refill from a lagging secondary could cache the pre-write document for a full TTL.
+page_cache = TTLCache(ttl=CACHE_TTL_SECONDS, max_size=CACHE_MAX_ENTRIES)
+
+def _on_change(coll_name, doc_id):
+    if coll_name is None:
+        page_cache.evict_prefix("")
+    elif coll_name == "users":
+        if doc_id is None:
+            page_cache.evict_prefix("pc:")
+        else:
+            page_cache.evict(f"pc:{doc_id}")
+    else:
+        page_cache.evict_prefix("home:")
+        page_cache.evict_prefix(f"{coll_name}:")
+
+cache_bus = CacheBus(db, ["events", "blogs", "users"], _on_change)
+
+def changed(coll, doc_id=None):
+    cache_bus.publish(coll.name, doc_id)
+
+notifier = Notifier(db, db.users, send_mail_batch, tenants.get,
+                    chunk_size=NOTIFY_CHUNK_SIZE, per_minute=NOTIFY_PER_MINUTE)
 
 def _emailchange_doc(uid, new_email):
     return email_changes.find_one({"user_id": ObjectId(uid), "new_email": new_email})
 
+def ro(coll):
+    return TenantCollection(reads.collection(coll.name, session.get("_last_write")), current_tenant_id)
+
 def require_login():
     return "user_id" in session
 
 def require_admin():
     return session.get("is_admin") is True
 
+BULK_ACTIONS = ("publish", "unpublish", "delete")
+
+def _bulk_ids():
+    return [ObjectId(v) for v in request.form.getlist("ids") if ObjectId.is_valid(v)]
+
+def _bulk_content(coll, action, ids):
+    if action == "delete":
+        ids = [d["_id"] for d in coll.find({"_id": {"$in": ids}}, {"_id": 1})]
+        n = coll.delete_many({"_id": {"$in": ids}}).deleted_count
+        if coll is events:
+            rsvp_book.delete_events(ids)
+    else:
+        n = coll.update_many({"_id": {"$in": ids}},
+                             {"$set": {"published": action == "publish", "updated_at": utcnow()}}).modified_count
+    changed(coll)
+    if action == "publish":
+        notifier.announce(coll, ids, g.tenant.id, request.url_root)
+    return n
+
 REQUIRED_RANGE = (1950, 2099)
 
 def is_profile_complete(u):
@@ -133,6 +268,33 @@ def is_profile_complete(u):
         return False
     return True
 
+def _load_profile_complete():
+    u = users.find_one(
+        {"_id": ObjectId(session["user_id"])},
+        {"full_name": 1, "branch": 1, "graduation_year": 1, "phone": 1, "linkedin": 1, "company": 1},
+    )
+    return is_profile_complete(u)
+
+@app.before_request
+def resolve_tenant():
+    g.tenant = tenants.resolve(request.host)
+    if request.path.startswith("/static"):
+        return
+    if session.get("tenant_id") != g.tenant.id:
+        for k in ("user_id", "is_admin", "chat_id", "_last_write", "_pc_notice"):
+            session.pop(k, None)
+        session["tenant_id"] = g.tenant.id
+
+@app.context_processor
+def inject_tenant():
+    return {"tenant": g.get("tenant", DEFAULT_TENANT)}
+
+@app.before_request
+def start_background():
+    cache_bus.start()
+    notifier.start()
+    contact_inbox.start()
+
 @app.before_request
 def enforce_profile_completion():
     g.profile_incomplete = False
@@ -150,11 +312,12 @@ def enforce_profile_completion():
     }
     if request.path.startswith("/admin/login"):
         return
-    u = users.find_one(
-        {"_id": ObjectId(session["user_id"])},
-        {"full_name": 1, "branch": 1, "graduation_year": 1, "phone": 1, "linkedin": 1, "company": 1},
-    )
-    if not is_profile_complete(u):
+    try:
+        complete = page_cache.get_or_set(f"pc:{session['user_id']}",
+                                         lambda: mongo_breaker.call(_load_profile_complete), fallback=True)
+    except (Unavailable, PyMongoError):
+        complete = True  # the gate only nudges; with Mongo down let the page serve its own fallback
+    if not complete:
         g.profile_incomplete = True
         if (request.path not in allowed) and (not request.path.startswith("/admin")):
             if not session.get("_pc_notice"):
@@ -164,18 +327,27 @@ def enforce_profile_completion():
     else:
         session.pop("_pc_notice", None)
 
-@app.route("/")
-def home():
-    if not require_login():
-        return redirect(url_for("login"))
+@app.errorhandler(Unavailable)
+@app.errorhandler(PyMongoError)
+def dependency_unavailable(e):
+    return f"{g.get('tenant', DEFAULT_TENANT).name} is temporarily unavailable. Please try again shortly.", 503
+
+def _home_content():
     today = utcnow()
-    upcoming = list(events.find({"published": True, "date": {"$gte": today}})
-                    .sort("date", ASCENDING).limit(6))
+    upcoming = find_rows(events, EventRow, {"published": True, "date": {"$gte": today}},
+                         sort=[("date", ASCENDING)], limit=6)
     try:
-        announcements = list(blogs.find({"published": True})
-                             .sort("created_at", DESCENDING).limit(6))
+        announcements = find_rows(blogs, BlogSummaryRow, {"published": True},
+                                  sort=[("created_at", DESCENDING)], limit=6)
     except Exception:
         announcements = []
+    return upcoming, announcements
+
+@app.route("/")
+def home():
+    if not require_login():
+        return redirect(url_for("login"))
+    upcoming, announcements = page_cache.get_or_set(f"home:{g.tenant.id}", lambda: mongo_breaker.call(_home_content), fallback=True)
     return render_template("home.html", upcoming=upcoming, announcements=announcements)
 
 @app.route("/settings/email", methods=["GET","POST"])
@@ -297,19 +469,10 @@ def alumni():
     if ors: filt["$or"] = ors
     if year.isdigit(): filt["graduation_year"] = int(year)
     if branch: filt["branch"] = {"$regex": f"^{re.escape(branch)}$", "$options": "i"}
-    total = users.count_documents(filt)
+    total = mongo_breaker.call(ro(users).count_documents, filt)
     skip = (page - 1) * per_page
-    cur = users.find(filt).sort([("graduation_year", DESCENDING), ("full_name", ASCENDING)]).skip(skip).limit(per_page)
-    rows = []
-    for u in cur:
-        rows.append({
-            "id": str(u["_id"]),
-            "full_name": u.get("full_name") or "",
-            "graduation_year": u.get("graduation_year") or "",
-            "branch": u.get("branch") or "",
-            "company": u.get("company") or "",
-            "linkedin": u.get("linkedin") or "",
-        })
+    rows = mongo_breaker.call(find_rows, ro(users), AlumniRow, filt,
+                              sort=[("graduation_year", DESCENDING), ("full_name", ASCENDING)], skip=skip, limit=per_page)
     pages = (total + per_page - 1) // per_page
     return render_template("alumni.html", rows=rows, q=q, year=year, branch=branch,
                            page=page, pages=pages, per_page=per_page, total=total)
@@ -340,8 +503,11 @@ def register():
         college_email = request.form.get("college_email", "").strip().lower()
         personal_email = request.form.get("personal_email", "").strip().lower()
         pwd = request.form.get("password", "")
-        if COLLEGE_EMAIL_DOMAIN and not college_email.endswith(COLLEGE_EMAIL_DOMAIN):
-            flash(f"Use your college email ({COLLEGE_EMAIL_DOMAIN}).", "danger")
+        if not g.tenant.accepts_registration(college_email):
+            if g.tenant.email_domain:
+                flash(f"Use your college email ({g.tenant.email_domain}).", "danger")
+            else:
+                flash("Registration is closed. Contact your college's alumni office.", "danger")
             return redirect(url_for("register"))
         if users.find_one({"$or":[{"college_email": college_email},{"personal_email": personal_email}]}):
             flash("Email already registered.", "danger")
@@ -359,7 +525,7 @@ def register():
             upsert=True
         )
         try:
-            send_mail(college_email, "Campus Circle – Verify your email", f"Your OTP is {code}. It expires in 10 minutes.")
+            send_mail(college_email, f"{g.tenant.name} – Verify your email", f"Your OTP is {code}. It expires in 10 minutes.")
         except:
             pass
         flash("OTP sent to your college email.", "info")
@@ -424,7 +590,7 @@ def forgot():
             upsert=True
         )
         try:
-            send_mail(email, "Campus Circle – Password Reset OTP", f"Your OTP is {code}. It expires in 10 minutes.")
+            send_mail(email, f"{g.tenant.name} – Password Reset OTP", f"Your OTP is {code}. It expires in 10 minutes.")
         except:
             pass
         return redirect(url_for("verify_reset", email=email))
@@ -489,7 +655,7 @@ def resend_reset():
         upsert=True
     )
     try:
-        send_mail(email, "Campus Circle – Password Reset OTP", f"Your OTP is {code}. It expires in 10 minutes.")
+        send_mail(email, f"{g.tenant.name} – Password Reset OTP", f"Your OTP is {code}. It expires in 10 minutes.")
     except:
         pass
     flash("OTP sent.", "success")
@@ -527,7 +693,8 @@ def password_reset():
 def profile():
     if not require_login():
         return redirect(url_for("login"))
-    u = users.find_one({"_id": ObjectId(session["user_id"])})
+    uid = ObjectId(session["user_id"])
+    u = find_row(users, ProfileRow, {"_id": uid})
     if not u:
         session.pop("user_id", None)
         return redirect(url_for("login"))
@@ -540,20 +707,24 @@ def profile():
             "phone": request.form.get("phone",""),
             "linkedin": request.form.get("linkedin",""),
         }
+        cadence = request.form.get("notify_cadence", DEFAULT_CADENCE)
+        if cadence not in CADENCES: cadence = DEFAULT_CADENCE
         errs = validate_profile_fields(data)
         if errs:
             for e in errs: flash(e, "danger")
             return redirect(url_for("profile"))
-        users.update_one({"_id": u["_id"]}, {"$set":{
+        users.update_one({"_id": uid}, {"$set":{
             "full_name": data["full_name"].strip() or None,
             "branch": data["branch"].strip() or None,
             "graduation_year": int(data["graduation_year"]) if data["graduation_year"].isdigit() else None,
             "company": data["company"].strip() or None,
             "phone": data["phone"].strip() or None,
             "linkedin": data["linkedin"].strip() or None,
+            "notify_cadence": cadence,
         }})
+        changed(users, uid)
         flash("Profile updated.", "success")
-        u_now = users.find_one({"_id": u["_id"]},
+        u_now = users.find_one({"_id": uid},
                                {"full_name":1,"branch":1,"graduation_year":1,"phone":1,"linkedin":1,"company":1})
         return redirect(url_for("home" if is_profile_complete(u_now) else "profile"))
     return render_template("profile.html", u=u)
@@ -564,11 +735,10 @@ def contact():
         name = request.form.get("name","").strip()
         email = request.form.get("email","").strip()
         msg = request.form.get("message","").strip()
-        contacts.insert_one({"name": name, "email": email, "message": msg, "created_at": utcnow()})
-        try:
-            send_mail(ADMIN_NOTIFY_EMAIL, "Campus Circle – Contact", f"From: {name} <{email}>\n\n{msg}")
-        except:
-            pass
+        if not (email and msg):
+            flash("Email and message are required.", "danger")
+            return redirect(url_for("contact"))
+        contact_inbox.submit(name, email, msg, g.tenant.id)
         flash("Message sent.", "success")
         return redirect(url_for("contact"))
     return render_template("contact.html")
@@ -579,43 +749,85 @@ def about():
 
 @app.route("/blog")
 def blog_list():
-    rows = []
-    for b in blogs.find({"published": True}).sort("created_at", DESCENDING):
-        rows.append(b)
+    rows = page_cache.get_or_set(f"blogs:{g.tenant.id}:list", lambda: mongo_breaker.call(
+        find_rows, blogs, BlogSummaryRow, {"published": True}, sort=[("created_at", DESCENDING)]), fallback=True)
     return render_template("blog_list.html", rows=rows)
 
 @app.route("/blog/<slug>")
 def blog_detail(slug):
-    b = blogs.find_one({"slug": slug, "published": True})
+    b = page_cache.get_or_set(f"blogs:{g.tenant.id}:{slug}", lambda: mongo_breaker.call(
+        find_row, blogs, BlogRow, {"slug": slug, "published": True}), fallback=True)
     if not b:
         abort(404)
-    return render_template("blog_detail.html", b=b)
+    if not b.body_hash:
+        doc = blogs.find_one({"_id": ObjectId(b.id)}, {"body": 1})
+        rendered = render_markdown(doc.get("body") if doc else "")
+        db.blogs.update_one({"_id": ObjectId(b.id)}, {"$set": rendered})  # raw handle: no _last_write on a GET
+        b.body_html, b.toc_html, b.body_hash = rendered["body_html"], rendered["toc_html"], rendered["body_hash"]
+    has_flashes = bool(session.get("_flashes"))
+    etag = f"{b.body_hash}-{'u' if require_login() else 'a'}"
+    if not has_flashes and request.if_none_match.contains_weak(etag):
+        resp = Response(status=304)
+    else:
+        resp = make_response(render_template("blog_detail.html", b=b))
+    if not has_flashes:
+        resp.set_etag(etag)
+        resp.headers["Cache-Control"] = "private, no-cache"
+    return resp
 
 @app.route("/event/<slug>")
 def event_detail(slug):
-    e = events.find_one({"slug": slug, "published": True})
+    e = page_cache.get_or_set(f"events:{g.tenant.id}:{slug}", lambda: mongo_breaker.call(
+        find_row, events, EventRow, {"slug": slug, "published": True}), fallback=True)
     if not e:
         abort(404)
-    return render_template("event_detail.html", e=e)
+    seats = mongo_breaker.call(rsvp_book.counts, ObjectId(e.id))
+    my_status, position = (None, None)
+    if require_login():
+        my_status, position = mongo_breaker.call(rsvp_book.status, ObjectId(e.id), ObjectId(session["user_id"]))
+    return render_template("event_detail.html", e=e, seats=seats, my_status=my_status, position=position)
+
+@app.post("/event/<slug>/rsvp")
+def event_rsvp(slug):
+    if not require_login():
+        return redirect(url_for("login"))
+    e = find_row(events, EventRow, {"slug": slug, "published": True})
+    if not e:
+        abort(404)
+    status = rsvp_book.rsvp(ObjectId(e.id), ObjectId(session["user_id"]))
+    if status == "going":
+        flash("You're on the list.", "success")
+    elif status == "waitlisted":
+        flash("The event is full; you've been added to the waitlist.", "info")
+    else:
+        flash("You have already RSVPed.", "warning")
+    return redirect(url_for("event_detail", slug=slug))
+
+@app.post("/event/<slug>/rsvp/cancel")
+def event_rsvp_cancel(slug):
+    if not require_login():
+        return redirect(url_for("login"))
+    e = find_row(events, EventRow, {"slug": slug})
+    if not e:
+        abort(404)
+    if rsvp_book.cancel(ObjectId(e.id), ObjectId(session["user_id"])):
+        flash("RSVP cancelled.", "info")
+    return redirect(url_for("event_detail", slug=slug))
 
 @app.route("/api/chat", methods=["POST"])
 def api_chat():
     q = (request.json or {}).get("message","").strip()
     if not q:
         return {"ok": False, "answer": ""}, 400
+    if "chat_id" not in session:
+        session["chat_id"] = secrets.token_urlsafe(12)
     try:
-        r = requests.post(f"{OLLAMA_HOST}/api/chat", json={
-            "model": OLLAMA_MODEL,
-            "messages": [
-                {"role":"system","content":"You are Campus Circle assistant."},
-                {"role":"user","content": q}
-            ],
-            "stream": False
-        }, timeout=30)
-        if r.status_code != 200:
-            return {"ok": False, "answer": ""}, 502
-        ans = r.json().get("message",{}).get("content","")
+        ans, _ = ollama_breaker.call(chat_memory.ask, session["chat_id"], q)
         return {"ok": True, "answer": ans}
+    except Unavailable:
+        return {"ok": False, "answer": "Chat is unavailable right now. Please try again in a few minutes."}, 503
+    except requests.HTTPError:
+        return {"ok": False, "answer": ""}, 502
     except Exception:
         return {"ok": False, "answer": ""}, 500
 
@@ -623,7 +835,7 @@ def api_chat():
 def admin_login():
     if request.method == "POST":
         pw = request.form.get("password","")
-        if pw == ADMIN_PASSWORD:
+        if g.tenant.check_admin_password(pw):
             session["is_admin"] = True
             return redirect(url_for("admin_index"))
         flash("Invalid admin password.", "danger")
@@ -659,18 +871,9 @@ def admin_events():
             {"venue": {"$regex": re.escape(q), "$options": "i"}},
             {"mode": {"$regex": re.escape(q), "$options": "i"}},
         ]
-    total = events.count_documents(filt)
+    total = ro(events).count_documents(filt)
     skip = (page - 1) * per_page
-    cur = events.find(filt).sort("date", DESCENDING).skip(skip).limit(per_page)
-    rows = []
-    for e in cur:
-        rows.append({
-            "id": str(e["_id"]),
-            "title": e.get("title") or "",
-            "slug": e.get("slug") or "",
-            "date": e.get("date"),
-            "published": bool(e.get("published")),
-        })
+    rows = find_rows(ro(events), AdminEventRow, filt, sort=[("date", DESCENDING)], skip=skip, limit=per_page)
     pages = (total + per_page - 1) // per_page
     return render_template("admin_events.html", events=rows, q=q, per_page=per_page, page=page, pages=pages, total=total)
 
@@ -686,6 +889,8 @@ def admin_events_new():
         mode = request.form.get("mode","").strip()
         join_url = safe_url(request.form.get("join_url","").strip())
         publish = bool(request.form.get("publish"))
+        cap = request.form.get("capacity","").strip()
+        capacity = int(cap) if cap.isdigit() else 0
         try:
             dt = datetime.fromisoformat(date_str)
             if dt.tzinfo is None:
@@ -694,18 +899,23 @@ def admin_events_new():
                 dt = dt.astimezone(timezone.utc)
         except:
             dt = utcnow()
-        events.insert_one({
+        res = events.insert_one({
             "title": title,
             "description": description,
             "date": dt,
             "venue": venue,
             "mode": mode,
             "join_url": join_url,
+            "capacity": capacity,
             "published": publish,
             "slug": slugify(title),
             "created_at": utcnow(),
             "updated_at": utcnow()
         })
+        rsvp_book.set_capacity(res.inserted_id, capacity)
+        changed(events, res.inserted_id)
+        if publish:
+            notifier.announce(events, [res.inserted_id], g.tenant.id, request.url_root)
         flash("Event saved.", "success")
         return redirect(url_for("admin_events"))
     return render_template("admin_event_new.html")
@@ -717,6 +927,8 @@ def admin_event_toggle(id):
     e = events.find_one({"_id": ObjectId(id)})
     if e:
         events.update_one({"_id": e["_id"]}, {"$set":{"published": not bool(e.get("published")),"updated_at": utcnow()}})
+        changed(events, e["_id"])
+        notifier.announce(events, [e["_id"]], g.tenant.id, request.url_root)
         flash("Event updated.", "success")
     return redirect(url_for("admin_events"))
 
@@ -724,10 +936,39 @@ def admin_event_toggle(id):
 def admin_event_delete(id):
     if not require_admin():
         return redirect(url_for("admin_login"))
-    events.delete_one({"_id": ObjectId(id)})
+    if events.delete_one({"_id": ObjectId(id)}).deleted_count:
+        rsvp_book.delete_events([ObjectId(id)])
+    changed(events, ObjectId(id))
     flash("Event deleted.", "warning")
     return redirect(url_for("admin_events"))
 
+@app.post("/admin/events/bulk")
+def admin_events_bulk():
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    action = request.form.get("action", "")
+    ids = _bulk_ids()
+    if action not in BULK_ACTIONS or not ids:
+        flash("Select events and an action.", "warning")
+        return redirect(url_for("admin_events"))
+    n = _bulk_content(events, action, ids)
+    if action == "delete":
+        flash(f"{n} event(s) deleted.", "warning")
+    else:
+        flash(f"{n} event(s) updated.", "success")
+    return redirect(url_for("admin_events"))
+
+@app.get("/admin/event/<id>/attendees.csv")
+def admin_event_attendees(id):
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    e = events.find_one({"_id": ObjectId(id)}, {"slug": 1})
+    if not e:
+        abort(404)
+    return Response(stream_with_context(rsvp_book.export_csv(e["_id"], ro(users))),
+                    mimetype="text/csv",
+                    headers={"Content-Disposition": f"attachment; filename={e.get('slug') or id}-attendees.csv"})
+
 @app.route("/admin/blogs")
 def admin_blogs():
     if not require_admin():
@@ -744,18 +985,9 @@ def admin_blogs():
             {"title": {"$regex": re.escape(q), "$options": "i"}},
             {"body": {"$regex": re.escape(q), "$options": "i"}},
         ]
-    total = blogs.count_documents(filt)
+    total = ro(blogs).count_documents(filt)
     skip = (page - 1) * per_page
-    cur = blogs.find(filt).sort("created_at", DESCENDING).skip(skip).limit(per_page)
-    rows = []
-    for b in cur:
-        rows.append({
-            "id": str(b["_id"]),
-            "title": b.get("title") or "",
-            "slug": b.get("slug") or "",
-            "published": bool(b.get("published")),
-            "created_at": b.get("created_at"),
-        })
+    rows = find_rows(ro(blogs), AdminBlogRow, filt, sort=[("created_at", DESCENDING)], skip=skip, limit=per_page)
     pages = (total + per_page - 1) // per_page
     return render_template("admin_blogs.html", blogs=rows, q=q, per_page=per_page, page=page, pages=pages, total=total)
 
@@ -767,14 +999,18 @@ def admin_blogs_new():
         title = request.form.get("title","").strip()
         body = request.form.get("body","").strip()
         publish = bool(request.form.get("publish"))
-        blogs.insert_one({
+        res = blogs.insert_one({
             "title": title,
             "body": body,
+            **render_markdown(body),
             "slug": slugify(title),
             "published": publish,
             "created_at": utcnow(),
             "updated_at": utcnow()
         })
+        changed(blogs, res.inserted_id)
+        if publish:
+            notifier.announce(blogs, [res.inserted_id], g.tenant.id, request.url_root)
         flash("Blog saved.", "success")
         return redirect(url_for("admin_blogs"))
     return render_template("admin_blog_new.html")
@@ -786,6 +1022,8 @@ def admin_blog_toggle(id):
     b = blogs.find_one({"_id": ObjectId(id)})
     if b:
         blogs.update_one({"_id": b["_id"]}, {"$set":{"published": not bool(b.get("published")),"updated_at": utcnow()}})
+        changed(blogs, b["_id"])
+        notifier.announce(blogs, [b["_id"]], g.tenant.id, request.url_root)
         flash("Blog updated.", "success")
     return redirect(url_for("admin_blogs"))
 
@@ -794,9 +1032,26 @@ def admin_blog_delete(id):
     if not require_admin():
         return redirect(url_for("admin_login"))
     blogs.delete_one({"_id": ObjectId(id)})
+    changed(blogs, ObjectId(id))
     flash("Blog deleted.", "warning")
     return redirect(url_for("admin_blogs"))
 
+@app.post("/admin/blogs/bulk")
+def admin_blogs_bulk():
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    action = request.form.get("action", "")
+    ids = _bulk_ids()
+    if action not in BULK_ACTIONS or not ids:
+        flash("Select blogs and an action.", "warning")
+        return redirect(url_for("admin_blogs"))
+    n = _bulk_content(blogs, action, ids)
+    if action == "delete":
+        flash(f"{n} blog(s) deleted.", "warning")
+    else:
+        flash(f"{n} blog(s) updated.", "success")
+    return redirect(url_for("admin_blogs"))
+
 @app.route("/admin/alumni")
 def admin_alumni():
     if not require_admin():
@@ -820,20 +1075,9 @@ def admin_alumni():
             {"company": {"$regex": re.escape(q), "$options": "i"}},
         ])
     if ors: filt["$or"] = ors
-    total = users.count_documents(filt)
+    total = ro(users).count_documents(filt)
     skip = (page - 1) * per_page
-    cur = users.find(filt).sort("created_at", DESCENDING).skip(skip).limit(per_page)
-    rows = []
-    for u in cur:
-        rows.append({
-            "id": str(u["_id"]),
-            "full_name": u.get("full_name") or "",
-            "college_email": u.get("college_email") or "",
-            "personal_email": u.get("personal_email") or "",
-            "graduation_year": u.get("graduation_year") or "",
-            "branch": u.get("branch") or "",
-            "company": u.get("company") or "",
-        })
+    rows = find_rows(ro(users), AdminAlumniRow, filt, sort=[("created_at", DESCENDING)], skip=skip, limit=per_page)
     pages = (total + per_page - 1) // per_page
     return render_template("admin_alumni.html", rows=rows, q=q, per_page=per_page, page=page, pages=pages, total=total)
 
@@ -841,10 +1085,108 @@ def admin_alumni():
 def admin_alumni_delete(id):
     if not require_admin():
         return redirect(url_for("admin_login"))
-    users.delete_one({"_id": ObjectId(id)})
+    if users.delete_one({"_id": ObjectId(id)}).deleted_count:
+        rsvp_book.delete_users([ObjectId(id)])
+    changed(users, ObjectId(id))
     flash("Alumnus deleted.", "warning")
     return redirect(url_for("admin_alumni"))
 
+@app.post("/admin/alumni/bulk")
+def admin_alumni_bulk():
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    ids = _bulk_ids()
+    if request.form.get("action") != "delete" or not ids:
+        flash("Select alumni to delete.", "warning")
+        return redirect(url_for("admin_alumni"))
+    ids = [u["_id"] for u in users.find({"_id": {"$in": ids}}, {"_id": 1})]
+    n = users.delete_many({"_id": {"$in": ids}}).deleted_count
+    rsvp_book.delete_users(ids)
+    changed(users)
+    flash(f"{n} alumni deleted.", "warning")
+    return redirect(url_for("admin_alumni"))
+
+@app.route("/admin/contacts")
+def admin_contacts():
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    q = (request.args.get("q") or "").strip()
+    status = request.args.get("status", "open")
+    if status not in ("open", "handled", "all"): status = "open"
+    try: per_page = int(request.args.get("n", "20"))
+    except: per_page = 20
+    if per_page not in (20, 50, 100): per_page = 20
+    try: page = max(1, int(request.args.get("page", "1")))
+    except: page = 1
+    filt = {}
+    if status == "open":
+        filt["status"] = {"$ne": "handled"}
+    elif status == "handled":
+        filt["status"] = "handled"
+    if q:
+        filt["$or"] = [
+            {"name": {"$regex": re.escape(q), "$options": "i"}},
+            {"email": {"$regex": re.escape(q), "$options": "i"}},
+            {"message": {"$regex": re.escape(q), "$options": "i"}},
+        ]
+    total = ro(contacts).count_documents(filt)
+    skip = (page - 1) * per_page
+    cur = ro(contacts).find(filt).sort("created_at", DESCENDING).skip(skip).limit(per_page)
+    rows = []
+    for c in cur:
+        rows.append({
+            "id": str(c["_id"]),
+            "name": c.get("name") or "",
+            "email": c.get("email") or "",
+            "message": c.get("message") or "",
+            "count": c.get("count") or 1,
+            "handled": c.get("status") == "handled",
+            "created_at": c.get("created_at"),
+        })
+    pages = (total + per_page - 1) // per_page
+    return render_template("admin_contacts.html", rows=rows, q=q, status=status, per_page=per_page, page=page, pages=pages, total=total)
+
+@app.post("/admin/contacts/bulk")
+def admin_contacts_bulk():
+    if not require_admin():
+        return redirect(url_for("admin_login"))
+    action = request.form.get("action", "")
+    ids = _bulk_ids()
+    if action not in ("handled", "open", "delete") or not ids:
+        flash("Select messages and an action.", "warning")
+        return redirect(url_for("admin_contacts"))
+    if action == "delete":
+        n = contacts.delete_many({"_id": {"$in": ids}}).deleted_count
+        flash(f"{n} message(s) deleted.", "warning")
+    else:
+        n = contacts.update_many({"_id": {"$in": ids}}, {"$set": {"status": action}}).modified_count
+        flash(f"{n} message(s) updated.", "success")
+    return redirect(url_for("admin_contacts"))
+
+@app.cli.command("rerender-blogs")
+def rerender_blogs():
+    """Re-render stored blog bodies whose HTML is missing or from an older renderer."""
+    filt = {"$or": [{"render_version": {"$ne": RENDER_VERSION}}, {"body_hash": None}]}
+    ops, n = [], 0
+    for b in db.blogs.find(filt, {"body": 1}):
+        ops.append(UpdateOne({"_id": b["_id"]}, {"$set": render_markdown(b.get("body") or "")}))
+        if len(ops) >= 200:
+            n += db.blogs.bulk_write(ops, ordered=False).modified_count
+            ops = []
+    if ops:
+        n += db.blogs.bulk_write(ops, ordered=False).modified_count
+    changed(db.blogs)
+    print(f"Re-rendered {n} blog(s).")
+
+@app.cli.command("assign-tenant")
+def assign_tenant():
+    """Tag documents created before multi-tenancy with the default tenant (also done at startup)."""
+    for name, n in assign_missing(db, DEFAULT_TENANT.id).items():
+        print(f"{name}: {n} document(s) assigned to {DEFAULT_TENANT.id}.")
+    cache_bus.publish("events")
+    cache_bus.publish("blogs")
+    cache_bus.publish("users")
+
 if __name__ == "__main__":
     port = int(os.getenv("PORT", "8000"))
     app.run(host="0.0.0.0", port=port)
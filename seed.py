@@ -8,9 +8,10 @@ mongo=MongoClient(MONGO_URL)
 db=mongo["campus_circle"]
 users=db["users"]
 events=db["events"]
+TENANT_ID=os.getenv("TENANT_ID","default")
 
-users.delete_many({})
-events.delete_many({})
+users.delete_many({"tenant_id":{"$in":[TENANT_ID,None]}})
+events.delete_many({"tenant_id":{"$in":[TENANT_ID,None]}})
 
 from random import choice, randint
 import secrets, string
@@ -26,6 +27,7 @@ for _ in range(80):
     br=choice(branches)
     pe=f"{fn.lower().replace(' ','')}@mail.com"
     users.insert_one({
+        "tenant_id": TENANT_ID,
         "college_email": f"{fn.lower().replace(' ','')}{yr}{br.lower()}@college.edu",
         "personal_email": pe,
         "password_hash": generate_password_hash("Pass@1234"),
@@ -43,9 +45,9 @@ for _ in range(80):
 
 base=datetime.utcnow()
 events.insert_many([
-    {"title":"Annual Alumni Meet","description":"Reunion and networking","date":base+timedelta(days=10),"published":True,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()},
-    {"title":"Mentorship Drive","description":"Alumni mentoring signups","date":base+timedelta(days=25),"published":True,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()},
-    {"title":"Webinar: Careers in AI","description":"Industry talk","date":base+timedelta(days=40),"published":False,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()}
+    {"tenant_id":TENANT_ID,"title":"Annual Alumni Meet","description":"Reunion and networking","date":base+timedelta(days=10),"published":True,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()},
+    {"tenant_id":TENANT_ID,"title":"Mentorship Drive","description":"Alumni mentoring signups","date":base+timedelta(days=25),"published":True,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()},
+    {"tenant_id":TENANT_ID,"title":"Webinar: Careers in AI","description":"Industry talk","date":base+timedelta(days=40),"published":False,"created_at":datetime.utcnow(),"updated_at":datetime.utcnow()}
 ])
 
 print("Seeded")
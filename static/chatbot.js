@@ -159,7 +159,15 @@ input[placeholder*="Ask about events"], input[placeholder*="alumni, register"]{d
     msg(val,true,false); inp.value="";
     var row=best(val);
     if(row){ msg("",false,linkify(row.text)); setQuick(SUGGEST[row.id]||SUGGEST.home); }
-    else{ msg("I didn’t catch that. Try the buttons below or ask about register, login, forgot/reset, change email, profile, alumni, events, blogs, or contact.",false,false); setQuick(SUGGEST.home); }
+    else{ ask(val); }
+  }
+  function ask(val){
+    var fallback="I didn’t catch that. Try the buttons below or ask about register, login, forgot/reset, change email, profile, alumni, events, blogs, or contact.";
+    setQuick(SUGGEST.home);
+    fetch("/api/chat",{method:"POST",headers:{"Content-Type":"application/json"},credentials:"same-origin",body:JSON.stringify({message:val})})
+      .then(function(r){ return r.json(); })
+      .then(function(d){ msg(d.ok&&d.answer?d.answer:fallback,false,false); })
+      .catch(function(){ msg(fallback,false,false); });
   }
   function sendLabel(label){
     var key=ALIASES[label]||label.toLowerCase(); var row=KB.find(r=>r.id===key);
@@ -0,0 +1,133 @@
+# tests/conftest.py
+import http.server
+import json
+import threading
+import time
+import mongomock
+import mongomock.database
+import pymongo
+import pytest
+from werkzeug.security import generate_password_hash
+
+ADMIN_PASSWORD = "test-admin"
+USER_PASSWORD = "test-pass"
+
+def _create_collection(self, name, **kwargs):
+    # mongomock has no capped collections; a plain one is enough for tests.
+    return _plain_create_collection(self, name)
+
+_plain_create_collection = mongomock.database.Database.create_collection
+
+@pytest.fixture
+def db():
+    return mongomock.MongoClient().campus_circle
+
+@pytest.fixture(scope="session")
+def app_module():
+    """app.py imported against an in-memory mongomock client, with background workers and SMTP disabled."""
+    with pytest.MonkeyPatch.context() as mp:
+        mp.setenv("MONGO_URL", "mongodb://localhost:27017")
+        mp.setenv("ADMIN_PASSWORD", ADMIN_PASSWORD)
+        mp.setenv("COLLEGE_EMAIL_DOMAIN", "@college.test")
+        mp.setenv("BREVO_SMTP_USER", "")
+        mp.setenv("BREVO_SMTP_PASS", "")
+        mp.setattr(pymongo, "MongoClient", mongomock.MongoClient)
+        mp.setattr(mongomock.database.Database, "create_collection", _create_collection)
+        import app
+        mp.setattr(app.cache_bus, "start", lambda: None)
+        mp.setattr(app.notifier, "start", lambda: None)
+        mp.setattr(app.contact_inbox, "start", lambda: None)
+        app.app.config["TESTING"] = True
+        yield app
+
+@pytest.fixture
+def admin_client(app_module):
+    c = app_module.app.test_client()
+    c.post("/admin/login", data={"password": ADMIN_PASSWORD})
+    return c
+
+@pytest.fixture
+def user(app_module):
+    """A verified alumnus with a complete profile in the default tenant."""
+    doc = {"tenant_id": app_module.DEFAULT_TENANT.id, "personal_email": "ann@mail.test",
+           "college_email": "ann@college.test", "password_hash": generate_password_hash(USER_PASSWORD),
+           "verified_at": app_module.utcnow(), "created_at": app_module.utcnow(),
+           "full_name": "Ann Lee", "branch": "CSE", "graduation_year": 2020, "phone": "+14155552671",
+           "linkedin": "https://linkedin.com/in/ann", "company": "Acme"}
+    doc["_id"] = app_module.db.users.insert_one(doc).inserted_id
+    yield doc
+    app_module.db.users.delete_one({"_id": doc["_id"]})
+
+@pytest.fixture
+def user_client(app_module, user):
+    c = app_module.app.test_client()
+    c.post("/login", data={"email": user["personal_email"], "password": USER_PASSWORD})
+    return c
+
+class CountingCollection:
+    """Wraps a pymongo/mongomock collection and records every operation sent through it."""
+
+    def __init__(self, coll):
+        self._coll = coll
+        self.calls = []
+
+    def __getattr__(self, name):
+        attr = getattr(self._coll, name)
+        if not callable(attr) or name.startswith("_"):
+            return attr
+
+        def op(*args, **kwargs):
+            self.calls.append(name)
+            return attr(*args, **kwargs)
+        return op
+
+@pytest.fixture
+def count_ops(monkeypatch):
+    """Swaps a TenantCollection's underlying collection for a CountingCollection; returns its call list."""
+    def install(tenant_coll):
+        counting = CountingCollection(tenant_coll.raw)
+        monkeypatch.setattr(tenant_coll, "raw", counting)
+        return counting.calls
+    return install
+
+class FakeOllama:
+    """Local stand-in for Ollama's streaming /api/chat. Tests set `status`, `delay` and `answer`."""
+
+    def __init__(self):
+        self.status = 200
+        self.delay = 0.0
+        self.answer = "Hello from the fake model."
+        self.requests = []
+        fake = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                body = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))) or b"{}")
+                fake.requests.append(body)
+                time.sleep(fake.delay)
+                self.send_response(fake.status)
+                self.send_header("Content-Type", "application/x-ndjson")
+                self.end_headers()
+                if fake.status != 200:
+                    return
+                for line in ({"message": {"content": fake.answer}, "done": False},
+                             {"done": True, "prompt_eval_count": 42, "eval_count": len(fake.answer) // 4}):
+                    self.wfile.write(json.dumps(line).encode() + b"\n")
+
+            def log_message(self, *args):
+                pass
+
+        self.server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.server.daemon_threads = True
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}"
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+
+    def close(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+@pytest.fixture
+def fake_ollama():
+    fake = FakeOllama()
+    yield fake
+    fake.close()
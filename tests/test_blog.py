@@ -0,0 +1,71 @@
+# tests/test_blog.py
+import pytest
+from utils.render import EXCERPT_LEN, render_markdown
+
+def test_excerpt_is_plain_text():
+    r = render_markdown("# Reunion\n\nJoin us **this Friday** & bring [friends](https://example.com).\n\n- food\n- music")
+    assert r["excerpt"] == "Reunion Join us this Friday & bring friends. food music"
+    assert r["excerpt_truncated"] is False
+
+def test_long_excerpt_is_truncated():
+    r = render_markdown("word " * 100)
+    assert len(r["excerpt"]) == EXCERPT_LEN
+    assert r["excerpt_truncated"] is True
+
+@pytest.fixture
+def post(app_module):
+    body = "## Part one\n\n**Bold** opening line.\n\n## Part two\n\nMore."
+    app_module.db.blogs.insert_one({"tenant_id": app_module.DEFAULT_TENANT.id, "title": "Notes", "slug": "notes",
+                                    "published": True, "body": body, "created_at": app_module.utcnow(),
+                                    **render_markdown(body)})
+    app_module.page_cache.clear()
+    yield
+    app_module.db.blogs.delete_many({})
+    app_module.page_cache.clear()
+
+def test_list_shows_plain_excerpt(app_module, user_client, post):
+    html = user_client.get("/blog").get_data(as_text=True)
+    assert "Part one Bold opening line." in html
+    assert "**" not in html and "## " not in html
+
+def test_page_with_flash_is_not_revalidated(app_module, user_client, post):
+    r = user_client.get("/blog/notes")
+    assert "Logged in." in r.get_data(as_text=True)
+    assert r.headers.get("ETag") is None
+
+    r = user_client.get("/blog/notes")
+    etag = r.headers.get("ETag")
+    assert etag
+    r = user_client.get("/blog/notes", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+
+    with user_client.session_transaction() as s:
+        s["_flashes"] = [("info", "New notice")]
+    r = user_client.get("/blog/notes", headers={"If-None-Match": etag})
+    assert r.status_code == 200
+    assert "New notice" in r.get_data(as_text=True)
+
+def test_not_modified_skips_rendering(app_module, user_client, post, monkeypatch):
+    user_client.get("/blog/notes")
+    etag = user_client.get("/blog/notes").headers["ETag"]
+    rendered = []
+    monkeypatch.setattr(app_module, "render_template", lambda *a, **kw: rendered.append(a) or "")
+    r = user_client.get("/blog/notes", headers={"If-None-Match": etag})
+    assert r.status_code == 304
+    assert r.headers["ETag"] == etag
+    assert not rendered
+
+def test_legacy_render_does_not_pin_reader_to_primary(app_module):
+    app_module.db.blogs.insert_one({"tenant_id": app_module.DEFAULT_TENANT.id, "title": "Old", "slug": "old",
+                                    "published": True, "body": "**legacy**", "created_at": app_module.utcnow()})
+    app_module.page_cache.clear()
+    try:
+        c = app_module.app.test_client()
+        r = c.get("/blog/old")
+        assert r.status_code == 200 and "<strong>legacy</strong>" in r.get_data(as_text=True)
+        assert app_module.db.blogs.find_one({"slug": "old"})["body_hash"]
+        with c.session_transaction() as s:
+            assert "_last_write" not in s
+    finally:
+        app_module.db.blogs.delete_many({})
+        app_module.page_cache.clear()
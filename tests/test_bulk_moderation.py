@@ -0,0 +1,42 @@
+# tests/test_bulk_moderation.py
+import pytest
+
+def _seed_events(app_module, n):
+    now = app_module.utcnow()
+    docs = [{"tenant_id": app_module.DEFAULT_TENANT.id, "title": f"Event {i}", "slug": f"bulk-event-{i}",
+             "date": now, "published": False, "published_at": None, "created_at": now} for i in range(n)]
+    return app_module.db.events.insert_many(docs).inserted_ids
+
+@pytest.fixture
+def clean_events(app_module):
+    yield
+    app_module.db.events.delete_many({})
+    app_module.db.notify_jobs.delete_many({})
+
+@pytest.mark.parametrize("n", [10, 100])
+def test_bulk_publish_round_trips_do_not_grow_with_selection(app_module, admin_client, count_ops, clean_events, n):
+    ids = _seed_events(app_module, n)
+    calls = count_ops(app_module.events)
+
+    for i in ids:
+        admin_client.post(f"/admin/event/{i}/toggle")
+    per_item = len(calls)
+    assert app_module.db.events.count_documents({"published": True}) == n
+
+    app_module.db.events.update_many({}, {"$set": {"published": False, "published_at": None}})
+    calls.clear()
+    r = admin_client.post("/admin/events/bulk", data={"action": "publish", "ids": [str(i) for i in ids]})
+    bulk = len(calls)
+
+    print(f"\n{n} events: per-item {per_item} ops, bulk {bulk} ops")
+    assert r.status_code == 302
+    assert app_module.db.events.count_documents({"published": True}) == n
+    assert per_item >= 2 * n
+    assert bulk <= 3
+
+def test_bulk_delete_is_constant_operations(app_module, admin_client, count_ops, clean_events):
+    ids = _seed_events(app_module, 50)
+    calls = count_ops(app_module.events)
+    admin_client.post("/admin/events/bulk", data={"action": "delete", "ids": [str(i) for i in ids]})
+    assert calls == ["find", "delete_many"]
+    assert app_module.db.events.count_documents({}) == 0
@@ -0,0 +1,53 @@
+# tests/test_cache.py
+import pytest
+from utils.cache import TTLCache
+
+def test_cache_is_bounded_lru():
+    cache = TTLCache(ttl=60, max_size=3)
+    for k in "abc":
+        cache.get_or_set(k, lambda k=k: k.upper())
+    cache.get_or_set("a", lambda: pytest.fail("should be a hit"))
+    cache.get_or_set("d", lambda: "D")
+    assert list(cache._data) == ["c", "a", "d"]
+
+def test_misses_are_not_cached():
+    cache = TTLCache()
+    calls = []
+    for _ in range(3):
+        assert cache.get_or_set("blogs:x", lambda: calls.append(1)) is None
+    assert len(calls) == 3
+    assert not cache._data
+
+def test_fallback_serves_last_good_value():
+    cache = TTLCache(ttl=60)
+    cache.get_or_set("home", lambda: "fresh", fallback=True)
+    cache.evict("home")
+
+    def down():
+        raise ConnectionError
+    assert cache.get_or_set("home", down, fallback=True) == "fresh"
+    with pytest.raises(ConnectionError):
+        cache.get_or_set("other", down, fallback=True)
+
+def test_unknown_slugs_do_not_grow_the_cache(app_module, user_client):
+    app_module.page_cache.clear()
+    for i in range(50):
+        assert user_client.get(f"/event/nope-{i}").status_code == 404
+        assert user_client.get(f"/blog/nope-{i}").status_code == 404
+    assert not [k for k in app_module.page_cache._data if "nope" in k]
+
+def test_shared_entries_are_filled_from_the_primary(app_module, user_client, monkeypatch):
+    now = app_module.utcnow()
+    app_module.db.events.insert_one({"tenant_id": app_module.DEFAULT_TENANT.id, "title": "Fresh", "slug": "fresh",
+                                     "published": True, "date": now.replace(year=now.year + 1)})
+    app_module.page_cache.clear()
+
+    def lagging(*a, **kw):
+        raise AssertionError("cache fill read from a secondary")
+    monkeypatch.setattr(app_module.reads, "collection", lagging)
+    try:
+        assert user_client.get("/event/fresh").status_code == 200
+        assert user_client.get("/").status_code == 200
+    finally:
+        app_module.db.events.delete_many({})
+        app_module.page_cache.clear()
@@ -0,0 +1,74 @@
+# tests/test_chat.py
+import time
+from utils.chat import ChatMemory
+from utils.resilience import Unavailable
+
+def _wait_for(pred, timeout=5):
+    deadline = time.monotonic() + timeout
+    while not pred():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+def test_overflow_is_summarized_after_answering(db, fake_ollama, monkeypatch):
+    monkeypatch.setattr(db, "create_collection", lambda name, **kw: db[name])
+    memory = ChatMemory(db, fake_ollama.url, "test-model", context_tokens=60, timeout=5)
+    fake_ollama.answer = "A fairly long answer that uses up a good part of the small token budget."
+    for i in range(3):
+        assert _wait_for(lambda: not memory._folding)
+        before = len(fake_ollama.requests)
+        answer, _ = memory.ask("c1", f"question number {i} about the reunion")
+        assert answer == fake_ollama.answer
+        assert len(fake_ollama.requests) == before + 1, "ask() made a second model call before answering"
+
+    assert _wait_for(lambda: (db.chat_conversations.find_one({"_id": "c1"}) or {}).get("summary"))
+    assert db.chat_conversations.find_one({"_id": "c1"})["summarized_until"]
+
+def test_slow_summary_does_not_delay_the_answer(db, fake_ollama, monkeypatch):
+    monkeypatch.setattr(db, "create_collection", lambda name, **kw: db[name])
+    memory = ChatMemory(db, fake_ollama.url, "test-model", context_tokens=40, timeout=5)
+    fake_ollama.answer = "x" * 120
+    memory.ask("c2", "first question")
+    fake_ollama.delay = 0.3
+    started = time.monotonic()
+    memory.ask("c2", "second question")
+    assert time.monotonic() - started < 0.5, "answer waited for the summary call"
+    assert _wait_for(lambda: len(fake_ollama.requests) == 3)
+
+def test_failed_summary_keeps_turns_for_the_next_fold(db, fake_ollama, monkeypatch):
+    monkeypatch.setattr(db, "create_collection", lambda name, **kw: db[name])
+    memory = ChatMemory(db, fake_ollama.url, "test-model", context_tokens=40, timeout=5)
+    fake_ollama.answer = "x" * 120
+    memory.ask("c3", "first question")
+
+    real_complete = memory._complete
+
+    def answer_but_fail_summaries(messages, num_predict=None):
+        if num_predict:
+            raise ConnectionError("ollama down")
+        return real_complete(messages)
+    monkeypatch.setattr(memory, "_complete", answer_but_fail_summaries)
+    memory.ask("c3", "second question")
+    assert _wait_for(lambda: not memory._folding)
+    conv = db.chat_conversations.find_one({"_id": "c3"})
+    assert not conv.get("summarized_until") and not conv.get("summary")
+
+    monkeypatch.setattr(memory, "_complete", real_complete)
+    memory.ask("c3", "third question")
+    assert _wait_for(lambda: (db.chat_conversations.find_one({"_id": "c3"}) or {}).get("summarized_until"))
+
+def test_folds_go_through_the_breaker(db, fake_ollama, monkeypatch):
+    monkeypatch.setattr(db, "create_collection", lambda name, **kw: db[name])
+    blocked = []
+
+    def open_circuit(fn, *args, **kwargs):
+        blocked.append(fn)
+        raise Unavailable("ollama circuit open")
+    memory = ChatMemory(db, fake_ollama.url, "test-model", context_tokens=40, timeout=5, call=open_circuit)
+    fake_ollama.answer = "x" * 120
+    memory.ask("c4", "first question")
+    memory.ask("c4", "second question")
+    assert _wait_for(lambda: not memory._folding)
+    assert blocked and len(fake_ollama.requests) == 2
+    assert not db.chat_conversations.find_one({"_id": "c4"}).get("summarized_until")
@@ -0,0 +1,81 @@
+# tests/test_contacts.py
+from datetime import datetime, timedelta, timezone
+from pymongo.errors import BulkWriteError
+from utils.contacts import ContactInbox, content_hash, ensure_indexes
+from utils.tenants import Tenant
+
+TENANTS = {None: Tenant("default", "Test College", notify_email="admin@college.test"),
+           "quiet": Tenant("quiet", "Quiet College")}
+
+def _inbox(coll, sent=None, state=None):
+    inbox = ContactInbox(coll, lambda to, subject, body: (sent if sent is not None else []).append((subject, body)),
+                         TENANTS.get, state, batch_size=100)
+    inbox.start = lambda: None
+    return inbox
+
+def test_hash_keeps_non_latin_text():
+    assert content_hash("a@b.c", "Привет, нужна помощь") != content_hash("a@b.c", "Когда встреча?")
+    assert content_hash("a@b.c", "नमस्ते") != content_hash("a@b.c", "धन्यवाद")
+    assert content_hash("A@B.c", "Hello,   WORLD!") == content_hash("a@b.c", "hello world")
+
+def test_repeat_of_handled_message_reopens_it(db):
+    ensure_indexes(db.contacts)
+    sent = []
+    inbox = _inbox(db.contacts, sent)
+    inbox.submit("Ann", "ann@mail.test", "Is the reunion on?")
+    inbox.flush()
+    assert inbox.send_digest() == 1
+    db.contacts.update_many({}, {"$set": {"status": "handled"}})
+
+    inbox.submit("Ann", "ann@mail.test", "Is the reunion on?")
+    inbox.flush()
+    doc = db.contacts.find_one()
+    assert (doc["count"], doc["status"], "digest_id" in doc) == (2, "open", False)
+    assert inbox.send_digest() == 1
+    assert sent[-1][0] == "Test College – 1 contact message(s)"
+    assert "(x2)" in sent[-1][1]
+
+def test_tenant_without_notify_email_gets_no_digest(db):
+    sent = []
+    inbox = _inbox(db.contacts, sent)
+    inbox.submit("Ann", "ann@mail.test", "hello", tenant_id="quiet")
+    inbox.flush()
+    assert inbox.send_digest() == 0
+    assert not sent
+
+class _PartlyFailing:
+    def __init__(self, coll, fail_index):
+        self.coll = coll
+        self.fail_index = fail_index
+
+    def bulk_write(self, ops, ordered=True):
+        for i, op in enumerate(ops):
+            if i != self.fail_index:
+                self.coll.bulk_write([op])
+        raise BulkWriteError({"writeErrors": [{"index": self.fail_index, "code": 11000}]})
+
+def test_partial_bulk_failure_rebuffers_only_failed_writes(db):
+    inbox = _inbox(_PartlyFailing(db.contacts, fail_index=1), state=db.contact_state)
+    for msg in ("first", "second", "third"):
+        inbox.submit("Ann", "ann@mail.test", msg)
+    assert inbox.flush() == 2
+    assert list(inbox._buf) == [content_hash("ann@mail.test", "second")]
+
+    inbox.coll = db.contacts
+    assert inbox.flush() == 1
+    assert sorted(d["count"] for d in db.contacts.find()) == [1, 1, 1]
+
+def test_submit_never_raises(db):
+    class Down:
+        def bulk_write(self, ops, ordered=True):
+            raise ConnectionError("mongo down")
+    inbox = ContactInbox(Down(), lambda *a: None, TENANTS.get, db.contact_state, batch_size=1)
+    inbox.start = lambda: None
+    inbox.submit("Ann", "ann@mail.test", "hello")
+    assert len(inbox._buf) == 1
+    inbox._buf.clear()
+
+def test_one_digest_per_period_across_workers(db):
+    workers = [_inbox(db.contacts) for _ in range(4)]
+    db.contact_state.insert_one({"_id": "digest", "last_run": datetime.now(timezone.utc) - timedelta(hours=1)})
+    assert [w._claim_digest() for w in workers] == [True, False, False, False]
@@ -0,0 +1,109 @@
+# tests/test_notify.py
+from datetime import datetime, timedelta, timezone
+import pytest
+from utils.notify import Notifier
+from utils.tenants import Tenant
+
+TENANT = Tenant("t1", "Test College", base_url="http://campus.test/")
+
+def tenant_for(tenant_id):
+    return TENANT
+
+class FlakySMTP:
+    """Records deliveries; raises on the call numbered `fail_on` to simulate a worker crash."""
+
+    def __init__(self, fail_on=None):
+        self.fail_on = fail_on
+        self.calls = 0
+        self.delivered = []
+
+    def __call__(self, messages):
+        self.calls += 1
+        if self.calls == self.fail_on:
+            raise ConnectionError("worker died mid-send")
+        self.delivered.extend(messages)
+
+@pytest.fixture
+def seeded(db):
+    now = datetime.now(timezone.utc)
+    db.users.insert_many([{"tenant_id": "t1", "personal_email": f"u{i}@mail.test", "notify_cadence": "daily"}
+                          for i in range(5)])
+    db.events.insert_one({"tenant_id": "t1", "title": "Reunion", "slug": "reunion", "published": True,
+                          "published_at": now - timedelta(hours=12), "date": now + timedelta(days=30)})
+    db.notify_state.insert_one({"_id": "daily", "last_run": now - timedelta(days=2)})
+    db.notify_state.insert_one({"_id": "weekly", "last_run": now})
+    return db
+
+def test_interrupted_digest_resumes_without_duplicates(seeded):
+    smtp = FlakySMTP(fail_on=2)
+    notifier = Notifier(seeded, seeded.users, smtp, tenant_for, chunk_size=2, per_minute=0)
+    notifier._queue_digest("daily")
+    with pytest.raises(ConnectionError):
+        notifier._run_one_job()
+    assert seeded.notify_jobs.find_one({"digest": "daily"})["status"] == "running"
+    assert not notifier._run_one_job(), "a job under lease was claimed twice"
+
+    seeded.notify_jobs.update_many({}, {"$set": {"lease_until": datetime.now(timezone.utc) - timedelta(seconds=1)}})
+    assert notifier._run_one_job()
+    recipients = [to for to, _, _ in smtp.delivered]
+    assert sorted(recipients) == sorted(f"u{i}@mail.test" for i in range(5))
+    assert seeded.notify_jobs.find_one({"digest": "daily"})["status"] == "done"
+    assert not notifier._run_one_job()
+
+def test_digest_is_queued_once_per_period(seeded):
+    notifier = Notifier(seeded, seeded.users, FlakySMTP(), tenant_for, per_minute=0)
+    notifier._queue_digest("daily")
+    notifier._queue_digest("daily")
+    notifier._queue_digest("weekly")
+    assert seeded.notify_jobs.count_documents({}) == 1
+
+def test_mail_uses_tenant_name_and_links(seeded):
+    smtp = FlakySMTP()
+    notifier = Notifier(seeded, seeded.users, smtp, tenant_for, per_minute=0)
+    notifier._queue_digest("daily")
+    notifier._run_one_job()
+    _, subject, body = smtp.delivered[0]
+    assert subject == "Test College – your daily digest"
+    assert "http://campus.test/event/reunion" in body
+
+def test_worker_stops_when_its_lease_is_taken_over(seeded):
+    stolen = []
+
+    def slow_smtp(messages):
+        if not stolen:
+            seeded.notify_jobs.update_one({}, {"$set": {"owner": "other-worker"}})
+            stolen.append(True)
+        smtp.delivered.extend(messages)
+    smtp = FlakySMTP()
+    notifier = Notifier(seeded, seeded.users, slow_smtp, tenant_for, chunk_size=2, per_minute=0)
+    notifier._queue_digest("daily")
+    assert notifier._run_one_job()
+
+    assert len(smtp.delivered) == 2
+    job = seeded.notify_jobs.find_one()
+    assert (job["owner"], job["status"], job["last_user_id"]) == ("other-worker", "running", None)
+
+def test_links_fall_back_to_the_publishing_host(seeded):
+    bare = Tenant("t1", "Test College")
+    smtp = FlakySMTP()
+    notifier = Notifier(seeded, seeded.users, smtp, lambda tid: bare, per_minute=0)
+    seeded.users.update_many({}, {"$set": {"notify_cadence": "instant"}})
+    blog_id = seeded.blogs.insert_one({"tenant_id": "t1", "title": "News", "slug": "news", "published": True,
+                                       "published_at": None}).inserted_id
+    notifier.start = lambda: None
+    notifier.announce(seeded.blogs, [blog_id], "t1", "https://north.test/")
+    notifier._run_one_job()
+    assert "https://north.test/blog/news" in smtp.delivered[0][2]
+
+    seeded.users.update_many({}, {"$set": {"notify_cadence": "daily"}})
+    smtp.delivered.clear()
+    notifier._queue_digest("daily")
+    notifier._run_one_job()
+    assert "https://north.test/event/reunion" in smtp.delivered[0][2]
+
+def test_job_without_any_base_url_sends_nothing(seeded):
+    smtp = FlakySMTP()
+    notifier = Notifier(seeded, seeded.users, smtp, lambda tid: Tenant("t1", "Test College"), per_minute=0)
+    notifier._queue_digest("daily")
+    assert notifier._run_one_job()
+    assert not smtp.delivered
@@ -0,0 +1,97 @@
+# tests/test_projections.py
+import bson
+import pytest
+from utils.repo import find_rows, find_row
+
+BIG = "x" * 50_000
+
+class MeasuredCursor:
+    def __init__(self, cursor, sizes):
+        self._cursor = cursor
+        self._sizes = sizes
+
+    def sort(self, *args, **kwargs):
+        self._cursor = self._cursor.sort(*args, **kwargs)
+        return self
+
+    def skip(self, n):
+        self._cursor = self._cursor.skip(n)
+        return self
+
+    def limit(self, n):
+        self._cursor = self._cursor.limit(n)
+        return self
+
+    def __iter__(self):
+        for doc in self._cursor:
+            self._sizes.append(len(bson.encode(doc)))
+            yield doc
+
+class MeasuredCollection:
+    """Records the BSON size of every document a view reads through find_rows/find_row."""
+
+    def __init__(self, coll, sizes):
+        self._coll = coll
+        self._sizes = sizes
+
+    def find(self, *args, **kwargs):
+        return MeasuredCursor(self._coll.find(*args, **kwargs), self._sizes)
+
+    def find_one(self, *args, **kwargs):
+        doc = self._coll.find_one(*args, **kwargs)
+        if doc:
+            self._sizes.append(len(bson.encode(doc)))
+        return doc
+
+@pytest.fixture
+def reply_sizes(app_module, monkeypatch):
+    sizes = []
+    monkeypatch.setattr(app_module, "find_rows",
+                        lambda coll, *a, **kw: find_rows(MeasuredCollection(coll, sizes), *a, **kw))
+    monkeypatch.setattr(app_module, "find_row",
+                        lambda coll, *a, **kw: find_row(MeasuredCollection(coll, sizes), *a, **kw))
+    return sizes
+
+@pytest.fixture
+def heavy_content(app_module, user):
+    """Documents carrying large fields no list view needs."""
+    tid = app_module.DEFAULT_TENANT.id
+    now = app_module.utcnow()
+    app_module.db.users.update_one({"_id": user["_id"]}, {"$set": {"notes": BIG}})
+    app_module.db.events.insert_one({"tenant_id": tid, "title": "Reunion", "slug": "reunion", "published": True,
+                                     "date": now.replace(year=now.year + 1), "description": "Annual meetup.",
+                                     "venue": "Hall", "mode": "offline", "attendee_notes": BIG, "created_at": now})
+    app_module.db.blogs.insert_one({"tenant_id": tid, "title": "Long read", "slug": "long-read", "published": True,
+                                    "body": BIG, "body_html": f"<p>{BIG}</p>", "toc_html": "", "body_hash": "h",
+                                    "created_at": now})
+    app_module.page_cache.clear()
+    yield
+    app_module.db.events.delete_many({})
+    app_module.db.blogs.delete_many({})
+    app_module.page_cache.clear()
+
+# Largest document (bytes of BSON) each view may pull from Mongo.
+ROUTE_BUDGETS = [
+    ("/", 1024),
+    ("/alumni", 512),
+    ("/blog", 1024),
+    ("/event/reunion", 1024),
+    ("/profile", 512),
+    ("/admin/events", 512),
+    ("/admin/blogs", 512),
+    ("/admin/alumni", 512),
+]
+
+@pytest.mark.parametrize("path,budget", ROUTE_BUDGETS)
+def test_views_fetch_only_projected_fields(app_module, user_client, heavy_content, reply_sizes, path, budget):
+    user_client.post("/admin/login", data={"password": "test-admin"})
+    r = user_client.get(path)
+    assert r.status_code == 200
+    assert reply_sizes, f"{path} read nothing through find_rows/find_row"
+    assert max(reply_sizes) <= budget, f"{path} fetched a {max(reply_sizes)}-byte document"
+
+def test_blog_detail_fetches_rendered_html_but_not_markdown_source(app_module, user_client, heavy_content,
+                                                                  reply_sizes):
+    r = user_client.get("/blog/long-read")
+    assert r.status_code == 200
+    assert len(BIG) < max(reply_sizes) < 2 * len(BIG)
@@ -0,0 +1,102 @@
+# tests/test_read_routing.py
+import os
+import shutil
+import socket
+import subprocess
+import time
+import pytest
+from pymongo import MongoClient, monitoring
+from pymongo.write_concern import WriteConcern
+from utils.db import ReadRouter
+
+def test_router_uses_primary_only_inside_staleness_window(db):
+    router = ReadRouter(db, max_staleness=90)
+    assert router.collection("events").database is router.secondary
+    assert router.collection("events", last_write=time.time() - 5).database is router.primary
+    assert router.collection("events", last_write=time.time() - 120).database is router.secondary
+
+def _last_write(client):
+    with client.session_transaction() as s:
+        return s.get("_last_write")
+
+def test_only_successful_writes_pin_reads_to_primary(app_module, user, user_client):
+    user_client.post("/api/chat", json={"message": "hello"})
+    user_client.post("/login", data={"email": user["personal_email"], "password": "wrong"})
+    user_client.post("/profile", data={"phone": "not-a-phone"})
+    assert _last_write(user_client) is None
+
+    user_client.post("/profile", data={"full_name": "Ann Lee", "branch": "CSE", "graduation_year": "2020",
+                                       "phone": "+14155552671", "linkedin": "https://linkedin.com/in/ann"})
+    assert _last_write(user_client) is not None
+
+# --- three-node replica set -------------------------------------------------
+# Uses MONGO_REPLSET_URL if set, otherwise starts three local mongod processes.
+# Skipped when neither is available.
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+@pytest.fixture(scope="module")
+def replset(tmp_path_factory):
+    if os.getenv("MONGO_REPLSET_URL"):
+        yield os.environ["MONGO_REPLSET_URL"]
+        return
+    mongod = shutil.which("mongod")
+    if not mongod:
+        pytest.skip("mongod not on PATH and MONGO_REPLSET_URL not set")
+    ports = [_free_port() for _ in range(3)]
+    procs = [subprocess.Popen([mongod, "--replSet", "rs0", "--port", str(p), "--bind_ip", "127.0.0.1",
+                               "--dbpath", str(tmp_path_factory.mktemp(f"rs{p}")), "--quiet"],
+                              stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL) for p in ports]
+    try:
+        seed = MongoClient(f"mongodb://127.0.0.1:{ports[0]}", directConnection=True, serverSelectionTimeoutMS=20000)
+        seed.admin.command("replSetInitiate", {"_id": "rs0", "members": [
+            {"_id": i, "host": f"127.0.0.1:{p}", "priority": 2 if i == 0 else 1} for i, p in enumerate(ports)]})
+        seed.close()
+        url = "mongodb://" + ",".join(f"127.0.0.1:{p}" for p in ports) + "/?replicaSet=rs0"
+        client = MongoClient(url)
+        deadline = time.monotonic() + 60
+        while not (client.primary and len(client.secondaries) == 2):
+            if time.monotonic() > deadline:
+                pytest.fail("replica set did not come up")
+            time.sleep(0.5)
+        client.close()
+        yield url
+    finally:
+        for p in procs:
+            p.terminate()
+            p.wait()
+
+class FindListener(monitoring.CommandListener):
+    def __init__(self):
+        self.servers = []
+
+    def started(self, event):
+        if event.command_name == "find":
+            self.servers.append(event.connection_id)
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+def test_replica_set_routing_and_read_your_writes(replset):
+    listener = FindListener()
+    client = MongoClient(replset, event_listeners=[listener])
+    try:
+        db = client.read_routing_test
+        router = ReadRouter(db)
+        db.items.with_options(write_concern=WriteConcern(w=3)).insert_one({"_id": "seed"})
+
+        assert router.collection("items").find_one({"_id": "seed"})
+        assert listener.servers[-1] in client.secondaries
+
+        db.items.insert_one({"_id": "mine"})
+        assert router.collection("items", last_write=time.time()).find_one({"_id": "mine"})
+        assert listener.servers[-1] == client.primary
+    finally:
+        client.drop_database("read_routing_test")
+        client.close()
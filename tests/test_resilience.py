@@ -0,0 +1,124 @@
+# tests/test_resilience.py
+import threading
+import time
+import pytest
+from utils.resilience import Breaker, Unavailable
+
+def _boom():
+    raise ConnectionError("down")
+
+def test_opens_after_threshold_and_fails_fast():
+    breaker = Breaker("dep", threshold=2, reset_seconds=60, errors=(ConnectionError,))
+    for _ in range(2):
+        with pytest.raises(ConnectionError):
+            breaker.call(_boom)
+    assert breaker.state == "open"
+    calls = []
+    with pytest.raises(Unavailable):
+        breaker.call(calls.append, 1)
+    assert not calls
+
+def test_unlisted_errors_do_not_trip_the_breaker():
+    breaker = Breaker("dep", threshold=1, errors=(ConnectionError,))
+    with pytest.raises(KeyError):
+        breaker.call(lambda: {}["x"])
+    assert breaker.state == "closed"
+
+def test_half_open_lets_a_single_trial_through():
+    breaker = Breaker("dep", threshold=1, reset_seconds=0.05, errors=(ConnectionError,))
+    with pytest.raises(ConnectionError):
+        breaker.call(_boom)
+    time.sleep(0.06)
+    assert breaker.state == "half-open"
+
+    in_trial, release = threading.Event(), threading.Event()
+
+    def trial():
+        in_trial.set()
+        release.wait(2)
+        return "ok"
+    t = threading.Thread(target=lambda: breaker.call(trial))
+    t.start()
+    in_trial.wait(2)
+    with pytest.raises(Unavailable):
+        breaker.call(lambda: "second")
+    release.set()
+    t.join()
+    assert breaker.state == "closed"
+    assert breaker.call(lambda: "after") == "after"
+
+def test_failed_trial_reopens_immediately():
+    breaker = Breaker("dep", threshold=3, reset_seconds=0.05, errors=(ConnectionError,))
+    for _ in range(3):
+        with pytest.raises(ConnectionError):
+            breaker.call(_boom)
+    time.sleep(0.06)
+    with pytest.raises(ConnectionError):
+        breaker.call(_boom)
+    assert breaker.state == "open"
+
+def test_bulkhead_rejects_calls_beyond_max_concurrent():
+    breaker = Breaker("dep", max_concurrent=1, wait_seconds=0.05)
+    busy, release = threading.Event(), threading.Event()
+    t = threading.Thread(target=lambda: breaker.call(lambda: (busy.set(), release.wait(2))))
+    t.start()
+    busy.wait(2)
+    started = time.monotonic()
+    with pytest.raises(Unavailable, match="bulkhead full"):
+        breaker.call(lambda: "queued")
+    assert time.monotonic() - started < 0.5
+    release.set()
+    t.join()
+    assert breaker.state == "closed"
+    assert breaker.call(lambda: "free") == "free"
+
+# --- app-level fault injection --------------------------------------------
+
+@pytest.fixture
+def reset_breakers(app_module):
+    def reset():
+        for b in (app_module.mongo_breaker, app_module.ollama_breaker):
+            b._failures, b._opened_at, b._trial = 0, None, False
+    reset()
+    yield
+    reset()
+
+@pytest.fixture
+def chat_against(app_module, fake_ollama, monkeypatch, reset_breakers):
+    monkeypatch.setattr(app_module.chat_memory, "ollama_host", fake_ollama.url)
+    monkeypatch.setattr(app_module.chat_memory, "timeout", 0.3)
+    return fake_ollama
+
+def test_chat_answers_through_the_fake_model(app_module, chat_against):
+    r = app_module.app.test_client().post("/api/chat", json={"message": "When is the reunion?"})
+    assert r.status_code == 200
+    assert r.json["answer"] == chat_against.answer
+
+@pytest.mark.parametrize("fault", ["error", "slow"])
+def test_chat_returns_503_once_ollama_keeps_failing(app_module, chat_against, fault):
+    if fault == "error":
+        chat_against.status = 500
+    else:
+        chat_against.delay = 0.6
+    c = app_module.app.test_client()
+    threshold = app_module.ollama_breaker.threshold
+    codes = [c.post("/api/chat", json={"message": "hi"}).status_code for _ in range(threshold)]
+    assert 503 not in codes
+    sent = len(chat_against.requests)
+
+    started = time.monotonic()
+    r = c.post("/api/chat", json={"message": "hi"})
+    assert r.status_code == 503
+    assert r.json["ok"] is False
+    assert time.monotonic() - started < 0.2
+    assert len(chat_against.requests) == sent, "an open circuit still called Ollama"
+
+def test_profile_gate_uses_fallback_while_mongo_is_down(app_module, user_client, reset_breakers):
+    assert user_client.get("/").status_code == 200
+    app_module.page_cache.evict_prefix("")
+    app_module.mongo_breaker._opened_at = time.monotonic()
+
+    started = time.monotonic()
+    r = user_client.get("/")
+    assert r.status_code == 200
+    assert time.monotonic() - started < 1
@@ -0,0 +1,114 @@
+# tests/test_rsvp.py
+import csv
+import io
+import os
+import threading
+import time
+import mongomock.collection
+import pytest
+from bson import ObjectId
+from pymongo import MongoClient
+from utils.rsvp import RSVPBook
+
+ATOMIC_WRITES = ("insert_one", "update_one", "find_one_and_update", "find_one_and_delete", "delete_many")
+
+@pytest.fixture
+def book(db, monkeypatch):
+    """RSVPBook on mongod when MONGO_TEST_URL is set, otherwise on mongomock.
+
+    mongomock applies a write as a separate find and modify, so its writes are serialized here
+    to give the single-document atomicity mongod guarantees.
+    """
+    if os.getenv("MONGO_TEST_URL"):
+        client = MongoClient(os.environ["MONGO_TEST_URL"])
+        client.drop_database("campus_circle_rsvp_test")
+        yield RSVPBook(client.campus_circle_rsvp_test)
+        client.drop_database("campus_circle_rsvp_test")
+        client.close()
+    else:
+        lock = threading.RLock()
+        for name in ATOMIC_WRITES:
+            method = getattr(mongomock.collection.Collection, name)
+
+            def atomic(self, *args, _method=method, **kwargs):
+                with lock:
+                    return _method(self, *args, **kwargs)
+            monkeypatch.setattr(mongomock.collection.Collection, name, atomic)
+        yield RSVPBook(db)
+
+def _rsvp_concurrently(book, event_id, users, workers=16):
+    results = []
+    lock = threading.Lock()
+    todo = iter(users)
+    start = threading.Barrier(workers)
+
+    def run():
+        start.wait()
+        while True:
+            with lock:
+                uid = next(todo, None)
+            if uid is None:
+                return
+            status = book.rsvp(event_id, uid)
+            with lock:
+                results.append(status)
+
+    threads = [threading.Thread(target=run) for _ in range(workers)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return results
+
+def _assert_consistent(book, event_id):
+    counts = book.counts(event_id)
+    going = book.attendees.count_documents({"event_id": event_id, "status": "going"})
+    waitlisted = book.attendees.count_documents({"event_id": event_id, "status": "waitlisted"})
+    assert (counts["going"], counts["waitlisted"]) == (going, waitlisted)
+    return counts
+
+@pytest.mark.parametrize("capacity,n", [(10, 64), (1, 32)])
+def test_concurrent_rsvps_never_oversubscribe(book, capacity, n):
+    event_id = ObjectId()
+    book.set_capacity(event_id, capacity)
+    results = _rsvp_concurrently(book, event_id, [ObjectId() for _ in range(n)])
+
+    assert results.count("going") == capacity
+    assert results.count("waitlisted") == n - capacity
+    counts = _assert_consistent(book, event_id)
+    assert counts["going"] == capacity
+
+def test_rsvp_throughput(book):
+    event_id = ObjectId()
+    book.set_capacity(event_id, 100)
+    n = 400
+    started = time.perf_counter()
+    results = _rsvp_concurrently(book, event_id, [ObjectId() for _ in range(n)])
+    elapsed = time.perf_counter() - started
+    print(f"\n{n} RSVPs in {elapsed:.2f}s ({n / elapsed:.0f}/s)")
+    assert len(results) == n
+    assert _assert_consistent(book, event_id)["going"] == 100
+
+def test_deleting_users_frees_seats_for_the_waitlist(book):
+    event_id = ObjectId()
+    book.set_capacity(event_id, 2)
+    spam, real = [ObjectId(), ObjectId()], [ObjectId(), ObjectId()]
+    for uid in spam + real:
+        book.rsvp(event_id, uid)
+
+    book.delete_users(spam)
+    assert [book.status(event_id, uid)[0] for uid in real] == ["going", "going"]
+    assert book.status(event_id, spam[0]) == (None, None)
+    counts = _assert_consistent(book, event_id)
+    assert (counts["going"], counts["waitlisted"]) == (2, 0)
+
+def test_export_escapes_formula_cells(book, db):
+    event_id, uid = ObjectId(), ObjectId()
+    db.users.insert_one({"_id": uid, "full_name": "Ann", "personal_email": "ann@mail.test",
+                         "company": '=HYPERLINK("http://evil.test","x")', "branch": "-CSE"})
+    book.set_capacity(event_id, 0)
+    book.rsvp(event_id, uid)
+    rows = list(csv.reader(io.StringIO("".join(book.export_csv(event_id, db.users)))))
+    assert rows[1][6] == "'=HYPERLINK(\"http://evil.test\",\"x\")"
+    assert rows[1][5] == "'-CSE"
+    assert rows[1][2] == "Ann"
@@ -0,0 +1,43 @@
+# tests/test_tenant_isolation.py
+import pytest
+from bson import ObjectId
+
+@pytest.fixture
+def north_event(app_module):
+    """An event with RSVPs that belongs to another college."""
+    now = app_module.utcnow()
+    eid = app_module.db.events.insert_one({"tenant_id": "north", "title": "North meetup", "slug": "north-meetup",
+                                           "published": True, "date": now, "created_at": now}).inserted_id
+    app_module.rsvp_book.set_capacity(eid, 5)
+    app_module.rsvp_book.rsvp(eid, ObjectId())
+    uid = app_module.db.users.insert_one({"tenant_id": "north", "personal_email": "n@mail.test"}).inserted_id
+    yield eid, uid
+    app_module.db.events.delete_many({})
+    app_module.db.users.delete_one({"_id": uid})
+    app_module.rsvp_book.delete_events([eid])
+
+def _intact(app_module, eid, uid):
+    assert app_module.db.events.find_one({"_id": eid})
+    assert app_module.db.users.find_one({"_id": uid})
+    assert app_module.rsvp_book.counts(eid)["going"] == 1
+    assert app_module.db.event_attendees.count_documents({"event_id": eid}) == 1
+
+def test_admin_cannot_delete_another_tenants_event_or_rsvps(app_module, admin_client, north_event):
+    eid, uid = north_event
+    admin_client.post(f"/admin/event/{eid}/delete")
+    admin_client.post("/admin/events/bulk", data={"action": "delete", "ids": [str(eid)]})
+    _intact(app_module, eid, uid)
+
+def test_admin_cannot_touch_another_tenants_alumni_or_content(app_module, admin_client, north_event):
+    eid, uid = north_event
+    admin_client.post(f"/admin/alumni/{uid}/delete")
+    admin_client.post("/admin/alumni/bulk", data={"action": "delete", "ids": [str(uid)]})
+    admin_client.post(f"/admin/event/{eid}/toggle")
+    admin_client.post("/admin/events/bulk", data={"action": "unpublish", "ids": [str(eid)]})
+    _intact(app_module, eid, uid)
+    assert app_module.db.events.find_one({"_id": eid})["published"] is True
+    assert admin_client.get(f"/admin/event/{eid}/attendees.csv").status_code == 404
+
+def test_other_tenants_event_is_not_visible(app_module, user_client, north_event):
+    app_module.page_cache.clear()
+    assert user_client.get("/event/north-meetup").status_code == 404
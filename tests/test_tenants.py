@@ -0,0 +1,57 @@
+# tests/test_tenants.py
+from utils.tenants import Tenant, TenantRegistry, assign_missing
+
+DEFAULT = Tenant("default", "Campus Circle", base_url="https://campus.test", email_domain="@college.test",
+                 notify_email="admin@college.test", admin_password="pw")
+
+def test_tenant_documents_inherit_nothing_from_the_default(db):
+    db.tenants.insert_one({"_id": "north", "name": "North College", "hosts": ["north.test", "www.north.test"]})
+    t = TenantRegistry(db.tenants, DEFAULT).resolve("north.test:8000")
+    assert (t.id, t.name, t.base_url) == ("north", "North College", "https://north.test")
+    assert t.email_domain == ""
+    assert not t.accepts_registration("anyone@anywhere.test")
+    assert t.notify_email == ""
+    assert not t.check_admin_password("pw")
+
+def test_explicit_base_url_wins(db):
+    db.tenants.insert_one({"_id": "south", "hosts": ["south.test"], "base_url": "https://alumni.south.test/"})
+    t = TenantRegistry(db.tenants, DEFAULT).get("south")
+    assert (t.name, t.base_url) == ("south", "https://alumni.south.test")
+
+def test_unknown_host_falls_back_to_default(db):
+    assert TenantRegistry(db.tenants, DEFAULT).resolve("elsewhere.test") is DEFAULT
+
+def test_assign_missing_is_idempotent(db):
+    db.users.insert_many([{"personal_email": "old@mail.test"}, {"personal_email": "new@mail.test", "tenant_id": "north"}])
+    assert assign_missing(db, "default")["users"] == 1
+    assert assign_missing(db, "default")["users"] == 0
+    assert sorted(u["tenant_id"] for u in db.users.find()) == ["default", "north"]
+
+def test_legacy_user_can_log_in_after_startup_backfill(app_module):
+    from werkzeug.security import generate_password_hash
+    uid = app_module.db.users.insert_one({"personal_email": "legacy@mail.test",
+                                          "password_hash": generate_password_hash("pw")}).inserted_id
+    try:
+        assign_missing(app_module.db, app_module.DEFAULT_TENANT.id)
+        r = app_module.app.test_client().post("/login", data={"email": "legacy@mail.test", "password": "pw"})
+        assert r.headers["Location"].endswith("/")
+    finally:
+        app_module.db.users.delete_one({"_id": uid})
+
+def test_registration_needs_a_domain_or_explicit_opt_in(db):
+    db.tenants.insert_many([{"_id": "east", "hosts": ["east.test"], "email_domain": "@east.edu"},
+                            {"_id": "open", "hosts": ["open.test"], "open_registration": True},
+                            {"_id": "typo", "hosts": ["typo.test"], "open_registration": "yes"}])
+    reg = TenantRegistry(db.tenants, DEFAULT)
+    assert reg.get("east").accepts_registration("a@east.edu")
+    assert not reg.get("east").accepts_registration("a@gmail.com")
+    assert reg.get("open").accepts_registration("a@gmail.com")
+    assert not reg.get("typo").accepts_registration("a@gmail.com")
+
+def test_register_route_rejects_when_tenant_has_no_domain(app_module, monkeypatch):
+    monkeypatch.setattr(app_module.tenants, "resolve", lambda host: Tenant("closed", "Closed College"))
+    r = app_module.app.test_client().post("/register", data={"college_email": "a@gmail.com",
+                                                            "personal_email": "a@mail.test", "password": "pw"},
+                                          follow_redirects=True)
+    assert "Registration is closed" in r.get_data(as_text=True)
+    assert not app_module.db.otps.find_one({"college_email": "a@gmail.com"})
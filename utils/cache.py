@@ -0,0 +1,163 @@
+# utils/cache.py
+import os
+import secrets
+import threading
+import time
+from collections import OrderedDict
+from pymongo import CursorType
+from pymongo.errors import OperationFailure, PyMongoError
+
+class TTLCache:
+    """Small per-process LRU cache; keys are "<namespace>:<id>" strings so a namespace can be dropped at once.
+
+    Holds at most `max_size` entries. A fill that returns None is not cached, so lookups of
+    missing slugs cannot grow it.
+    """
+
+    def __init__(self, ttl=60, max_size=2048):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._data = OrderedDict()
+        self._stale = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_set(self, key, fn, ttl=None, fallback=False):
+        """With fallback=True the last good value survives eviction and is served if fn() raises."""
+        now = time.monotonic()
+        with self._lock:
+            hit = self._data.get(key)
+            if hit and hit[0] > now:
+                self._data.move_to_end(key)
+                return hit[1]
+            if hit:
+                del self._data[key]
+        try:
+            value = fn()
+        except Exception:
+            with self._lock:
+                if fallback and key in self._stale:
+                    return self._stale[key]
+            raise
+        if value is None:
+            return None
+        with self._lock:
+            self._put(self._data, key, (now + (ttl or self.ttl), value))
+            if fallback:
+                self._put(self._stale, key, value)
+        return value
+
+    def _put(self, store, key, value):
+        store[key] = value
+        store.move_to_end(key)
+        while len(store) > self.max_size:
+            store.popitem(last=False)
+
+    def evict(self, *keys):
+        with self._lock:
+            for k in keys:
+                self._data.pop(k, None)
+
+    def evict_prefix(self, prefix):
+        with self._lock:
+            for k in [k for k in self._data if k.startswith(prefix)]:
+                del self._data[k]
+
+    def clear(self):
+        """Drops every entry, including last-good fallback values."""
+        with self._lock:
+            self._data.clear()
+            self._stale.clear()
+
+class CacheBus:
+    """Fans cache invalidations out to every worker process.
+
+    On a replica set each worker watches a change stream on the given collections and resumes
+    from its last token after a dropped connection. A standalone mongod has no change streams,
+    so writers instead append to a capped collection that every worker tails.
+    """
+
+    def __init__(self, db, collections, on_change, capped_name="cache_invalidations", poll_seconds=0.5):
+        self.db = db
+        self.collections = list(collections)
+        self.on_change = on_change
+        self.capped_name = capped_name
+        self.poll_seconds = poll_seconds
+        self.mode = None
+        self._resume_token = None
+        self._thread = None
+        self._pid = None
+        self._origin = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            if self.mode is None:
+                self.mode = "stream" if self._streams_supported() else "poll"
+                if self.mode == "poll":
+                    self._ensure_capped()
+            self._pid = os.getpid()
+            self._origin = secrets.token_hex(6)
+            self._resume_token = None
+            target = self._run_stream if self.mode == "stream" else self._run_poll
+            self._thread = threading.Thread(target=target, name="cache-bus", daemon=True)
+            self._thread.start()
+
+    def publish(self, coll_name, doc_id=None):
+        """Record a local write. Change streams already carry it; the polling fallback needs an explicit entry."""
+        self.on_change(coll_name, doc_id)
+        if self.mode == "poll":
+            self.db[self.capped_name].insert_one({"ns": coll_name, "doc_id": doc_id, "origin": self._origin})
+
+    def _streams_supported(self):
+        try:
+            with self.db.watch(max_await_time_ms=1):
+                return True
+        except OperationFailure:
+            return False
+
+    def _ensure_capped(self):
+        if self.capped_name not in self.db.list_collection_names(filter={"name": self.capped_name}):
+            try:
+                self.db.create_collection(self.capped_name, capped=True, size=1 << 20, max=5000)
+            except OperationFailure:
+                pass
+            self.db[self.capped_name].insert_one({"ns": None})
+
+    def _run_stream(self):
+        pipeline = [{"$match": {"ns.coll": {"$in": self.collections}}}]
+        while True:
+            try:
+                with self.db.watch(pipeline, resume_after=self._resume_token) as stream:
+                    for change in stream:
+                        self._resume_token = stream.resume_token
+                        self.on_change(change["ns"]["coll"], change.get("documentKey", {}).get("_id"))
+            except OperationFailure as e:
+                print("[cache] change stream lost, restarting:", e)
+                self._resume_token = None
+                self.on_change(None, None)
+                time.sleep(1)
+            except PyMongoError as e:
+                print("[cache] change stream error, resuming:", e)
+                time.sleep(1)
+
+    def _run_poll(self):
+        coll = self.db[self.capped_name]
+        last = coll.find_one(sort=[("$natural", -1)])
+        last_id = last["_id"] if last else None
+        while True:
+            try:
+                filt = {"_id": {"$gt": last_id}} if last_id else {}
+                cur = (coll.find(filt, cursor_type=CursorType.TAILABLE_AWAIT)
+                       .max_await_time_ms(int(self.poll_seconds * 1000)))
+                while cur.alive:
+                    for d in cur:
+                        last_id = d["_id"]
+                        if d.get("ns") and d.get("origin") != self._origin:
+                            self.on_change(d["ns"], d.get("doc_id"))
+            except PyMongoError as e:
+                print("[cache] invalidation poll failed:", e)
+            time.sleep(self.poll_seconds)
@@ -0,0 +1,161 @@
+# utils/chat.py
+import json
+import os
+import queue
+import threading
+import time
+import requests
+from datetime import datetime, timezone
+from pymongo import ASCENDING, DESCENDING
+from pymongo.errors import CollectionInvalid
+
+SYSTEM_PROMPT = "You are Campus Circle assistant."
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 chars per token); good enough for budgeting."""
+    return max(1, len(text or "") // 4)
+
+class ChatMemory:
+    """Per-conversation chat history with a bounded prompt.
+
+    Turns live in a capped collection. Each prompt carries the system message, a rolling
+    summary of older turns and as many recent turns as fit in the token budget; turns that
+    fall out of the budget are folded into the summary instead of being resent. Folding is a
+    second model call, so it runs on a background thread after the answer has been returned.
+    """
+
+    def __init__(self, db, ollama_host, model, context_tokens=1500, keep_alive="10m",
+                 timeout=30, connect_timeout=3, call=None, turns_name="chat_turns", convs_name="chat_conversations"):
+        self.ollama_host = ollama_host
+        self.model = model
+        self.context_tokens = context_tokens
+        self.keep_alive = keep_alive
+        self.timeout = timeout
+        self.connect_timeout = connect_timeout
+        self.call = call or (lambda fn, *args, **kwargs: fn(*args, **kwargs))
+        if turns_name not in db.list_collection_names(filter={"name": turns_name}):
+            try:
+                db.create_collection(turns_name, capped=True, size=16 << 20)
+            except CollectionInvalid:
+                pass
+        self.turns = db[turns_name]
+        self.convs = db[convs_name]
+        self.turns.create_index([("conv_id", ASCENDING), ("_id", ASCENDING)])
+        self._folds = queue.Queue()
+        self._folding = set()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+
+    def ask(self, conv_id, question):
+        conv = self.convs.find_one({"_id": conv_id}) or {}
+        messages, dropped = self._build(conv_id, conv, question)
+        answer, stats = self._complete(messages)
+        now = datetime.now(timezone.utc)
+        self.turns.insert_many([
+            {"conv_id": conv_id, "role": "user", "content": question,
+             "tokens": estimate_tokens(question), "created_at": now},
+            {"conv_id": conv_id, "role": "assistant", "content": answer,
+             "tokens": stats["completion_tokens"] or estimate_tokens(answer), "created_at": now},
+        ])
+        self.convs.update_one({"_id": conv_id}, {
+            "$inc": {"turns": 1, "prompt_tokens": stats["prompt_tokens"],
+                     "completion_tokens": stats["completion_tokens"]},
+            "$set": {"last_prompt_tokens": stats["prompt_tokens"], "last_ttft_ms": stats["ttft_ms"],
+                     "updated_at": now},
+            "$max": {"max_prompt_tokens": stats["prompt_tokens"], "max_ttft_ms": stats["ttft_ms"]},
+            "$setOnInsert": {"created_at": now},
+        }, upsert=True)
+        if dropped:
+            self._schedule_fold(conv_id, dropped)
+        return answer, stats
+
+    def _schedule_fold(self, conv_id, dropped):
+        with self._lock:
+            if conv_id in self._folding:
+                return
+            self._folding.add(conv_id)
+            if not (self._thread and self._thread.is_alive() and self._pid == os.getpid()):
+                self._pid = os.getpid()
+                self._thread = threading.Thread(target=self._run_folds, name="chat-summarizer", daemon=True)
+                self._thread.start()
+        self._folds.put((conv_id, dropped))
+
+    def _run_folds(self):
+        while True:
+            conv_id, dropped = self._folds.get()
+            try:
+                self._fold(conv_id, self.convs.find_one({"_id": conv_id}) or {}, dropped)
+            except Exception as e:
+                print("[chat] summarizing failed:", e)
+            finally:
+                with self._lock:
+                    self._folding.discard(conv_id)
+
+    def _build(self, conv_id, conv, question):
+        summary = conv.get("summary") or ""
+        head = [{"role": "system", "content": SYSTEM_PROMPT}]
+        if summary:
+            head.append({"role": "system", "content": f"Summary of the earlier conversation: {summary}"})
+        budget = self.context_tokens - sum(estimate_tokens(m["content"]) for m in head) - estimate_tokens(question)
+        filt = {"conv_id": conv_id}
+        if conv.get("summarized_until"):
+            filt["_id"] = {"$gt": conv["summarized_until"]}
+        recent, dropped = [], []
+        for t in self.turns.find(filt, {"role": 1, "content": 1, "tokens": 1}).sort("_id", DESCENDING):
+            if not dropped and budget - t.get("tokens", 0) >= 0:
+                budget -= t.get("tokens", 0)
+                recent.append(t)
+            else:
+                dropped.append(t)
+        recent.reverse()
+        dropped.reverse()
+        messages = head + [{"role": t["role"], "content": t["content"]} for t in recent]
+        messages.append({"role": "user", "content": question})
+        return messages, dropped
+
+    def _fold(self, conv_id, conv, dropped):
+        transcript = "\n".join(f"{t['role']}: {t['content']}" for t in dropped)
+        prompt = [
+            {"role": "system", "content": "Summarize the conversation in at most 80 words. Keep names, dates and open questions."},
+            {"role": "user", "content": f"Earlier summary: {conv.get('summary') or '(none)'}\n\n{transcript}"},
+        ]
+        try:
+            summary, _ = self.call(self._complete, prompt, num_predict=160)
+        except Exception as e:
+            print("[chat] summary call failed, keeping turns for the next fold:", e)
+            return
+        self.convs.update_one({"_id": conv_id}, {
+            "$set": {"summary": summary.strip(), "summarized_until": dropped[-1]["_id"]},
+            "$inc": {"summaries": 1},
+        }, upsert=True)
+
+    def _complete(self, messages, num_predict=None):
+        payload = {"model": self.model, "messages": messages, "stream": True, "keep_alive": self.keep_alive}
+        if num_predict:
+            payload["options"] = {"num_predict": num_predict}
+        start = time.perf_counter()
+        ttft = None
+        parts, final = [], {}
+        with requests.post(f"{self.ollama_host}/api/chat", json=payload, stream=True,
+                           timeout=(self.connect_timeout, self.timeout)) as r:
+            r.raise_for_status()
+            for line in r.iter_lines():
+                if time.perf_counter() - start > self.timeout:
+                    raise requests.Timeout(f"no complete answer within {self.timeout}s")
+                if not line:
+                    continue
+                chunk = json.loads(line)
+                piece = chunk.get("message", {}).get("content", "")
+                if piece:
+                    if ttft is None:
+                        ttft = (time.perf_counter() - start) * 1000
+                    parts.append(piece)
+                if chunk.get("done"):
+                    final = chunk
+                    break
+        return "".join(parts), {
+            "prompt_tokens": int(final.get("prompt_eval_count") or 0),
+            "completion_tokens": int(final.get("eval_count") or 0),
+            "ttft_ms": round(ttft or (time.perf_counter() - start) * 1000, 1),
+        }
@@ -0,0 +1,162 @@
+# utils/contacts.py
+import hashlib
+import os
+import re
+import threading
+import time
+import atexit
+import secrets
+from datetime import datetime, timedelta, timezone
+from pymongo import UpdateOne, ASCENDING, DESCENDING
+from pymongo.errors import BulkWriteError
+
+_WS_RE = re.compile(r"\s+")
+_NOISE_RE = re.compile(r"[^\w@ ]+")
+
+def content_hash(email, message, tenant_id=None):
+    """Hash of the normalized sender and body; near-identical spam collapses to one key.
+
+    Normalization casefolds and drops punctuation but keeps letters of any script.
+    """
+    norm = _NOISE_RE.sub("", _WS_RE.sub(" ", f"{email} {message}".casefold())).strip()
+    if tenant_id:
+        norm = f"{tenant_id}\0{norm}"
+    return hashlib.sha256(norm.encode("utf-8")).hexdigest()
+
+def ensure_indexes(coll):
+    coll.create_index([("created_at", DESCENDING)])
+    coll.create_index([("status", ASCENDING), ("created_at", DESCENDING)])
+    coll.create_index("hash", unique=True, partialFilterExpression={"hash": {"$exists": True}})
+    coll.create_index("digest_id", sparse=True)
+
+class ContactInbox:
+    """Buffers contact-form writes and mails admins a periodic digest instead of one mail per message.
+
+    `tenant_for` maps a tenant id to its Tenant, so each college's admins get their own digest under
+    their own name; tenants without a notify_email get none and read messages in the admin inbox.
+    A repeat of a message that was already handled or digested reopens it, so it is seen again.
+    Every worker runs the flush loop, but each digest period is claimed through a shared state
+    document, so admins get one digest per period however many workers there are.
+    """
+
+    def __init__(self, coll, send_mail, tenant_for, state=None, batch_size=50, flush_seconds=5, digest_minutes=15):
+        self.coll = coll
+        self.state = state if state is not None else coll.database["contact_state"]
+        self.send_mail = send_mail
+        self.tenant_for = tenant_for
+        self.batch_size = batch_size
+        self.flush_seconds = flush_seconds
+        self.digest_seconds = digest_minutes * 60
+        self._buf = {}
+        self._lock = threading.Lock()
+        self._thread = None
+        self._pid = None
+        atexit.register(self.flush)
+
+    def submit(self, name, email, message, tenant_id=None):
+        now = datetime.now(timezone.utc)
+        h = content_hash(email, message, tenant_id)
+        with self._lock:
+            self._merge({"name": name, "email": email, "message": message, "tenant_id": tenant_id,
+                         "hash": h, "created_at": now, "last_seen": now, "count": 1})
+            full = len(self._buf) >= self.batch_size
+        self.start()
+        if full:
+            try:
+                self.flush()
+            except Exception as e:
+                print("[contacts] flush failed, will retry in the background:", e)
+
+    def _merge(self, doc):
+        cur = self._buf.get(doc["hash"])
+        if not cur:
+            self._buf[doc["hash"]] = doc
+            return
+        cur["count"] += doc["count"]
+        cur["created_at"] = min(cur["created_at"], doc["created_at"])
+        cur["last_seen"] = max(cur["last_seen"], doc["last_seen"])
+
+    def flush(self):
+        """Writes buffered messages; only writes that failed go back into the buffer."""
+        with self._lock:
+            pending, self._buf = list(self._buf.values()), {}
+        if not pending:
+            return 0
+        ops = [UpdateOne(
+            {"hash": d["hash"], "tenant_id": d["tenant_id"]},
+            {"$setOnInsert": {"name": d["name"], "email": d["email"], "message": d["message"],
+                              "created_at": d["created_at"]},
+             "$set": {"last_seen": d["last_seen"], "status": "open"},
+             "$unset": {"digest_id": ""},
+             "$inc": {"count": d["count"]}},
+            upsert=True) for d in pending]
+        try:
+            self.coll.bulk_write(ops, ordered=False)
+        except BulkWriteError as e:
+            failed = [pending[err["index"]] for err in e.details.get("writeErrors", [])]
+            with self._lock:
+                for d in failed:
+                    self._merge(d)
+            print(f"[contacts] {len(failed)} of {len(ops)} buffered message(s) failed, retrying later")
+            return len(ops) - len(failed)
+        except Exception:
+            with self._lock:
+                for d in pending:
+                    self._merge(d)
+            raise
+        return len(ops)
+
+    def send_digest(self):
+        token = secrets.token_hex(8)
+        self.coll.update_many({"hash": {"$exists": True}, "digest_id": {"$exists": False}},
+                              {"$set": {"digest_id": token}})
+        rows = list(self.coll.find({"digest_id": token},
+                                   {"name": 1, "email": 1, "message": 1, "count": 1, "tenant_id": 1})
+                    .sort("created_at", ASCENDING))
+        by_tenant = {}
+        for r in rows:
+            by_tenant.setdefault(r.get("tenant_id"), []).append(r)
+        sent = 0
+        for tenant_id, group in by_tenant.items():
+            tenant = self.tenant_for(tenant_id)
+            if not tenant.notify_email:
+                continue
+            parts = []
+            for r in group:
+                dup = f" (x{r.get('count', 1)})" if r.get("count", 1) > 1 else ""
+                parts.append(f"From: {r.get('name')} <{r.get('email')}>{dup}\n\n{r.get('message')}")
+            body = f"{len(group)} new contact message(s).\n\n" + "\n\n----\n\n".join(parts)
+            try:
+                self.send_mail(tenant.notify_email, f"{tenant.name} – {len(group)} contact message(s)", body)
+                sent += len(group)
+            except Exception:
+                self.coll.update_many({"_id": {"$in": [r["_id"] for r in group]}}, {"$unset": {"digest_id": ""}})
+        return sent
+
+    def _claim_digest(self):
+        now = datetime.now(timezone.utc)
+        self.state.update_one({"_id": "digest"}, {"$setOnInsert": {"last_run": now}}, upsert=True)
+        return self.state.find_one_and_update(
+            {"_id": "digest", "last_run": {"$lte": now - timedelta(seconds=self.digest_seconds)}},
+            {"$set": {"last_run": now}},
+        ) is not None
+
+    def start(self):
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="contact-inbox", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            time.sleep(self.flush_seconds)
+            try:
+                self.flush()
+                if self._claim_digest():
+                    self.send_digest()
+            except Exception as e:
+                print("[contacts] background flush failed:", e)
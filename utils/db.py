@@ -0,0 +1,25 @@
+# utils/db.py
+import time
+from pymongo.read_preferences import SecondaryPreferred
+
+class ReadRouter:
+    """Hands out collections for non-critical reads, routed to secondaries within a staleness bound.
+
+    Callers that just wrote pass the time of that write; until the staleness window has
+    passed, reads go to the primary so a user always sees their own changes.
+    """
+
+    def __init__(self, db, max_staleness=90):
+        self.primary = db
+        self.max_staleness = max_staleness
+        self.secondary = db.client.get_database(
+            db.name,
+            read_preference=SecondaryPreferred(max_staleness=max_staleness),
+            codec_options=db.codec_options,
+            write_concern=db.write_concern,
+        )
+
+    def collection(self, name, last_write=None):
+        if last_write and time.time() - last_write < self.max_staleness:
+            return self.primary[name]
+        return self.secondary[name]
@@ -0,0 +1,181 @@
+# utils/notify.py
+import os
+import secrets
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from pymongo import ASCENDING, DESCENDING, ReturnDocument
+
+CADENCES = ("instant", "daily", "weekly", "none")
+DEFAULT_CADENCE = "daily"
+DIGEST_PERIODS = {"daily": timedelta(days=1), "weekly": timedelta(days=7)}
+
+def cadence_filter(cadence):
+    if cadence == DEFAULT_CADENCE:
+        return {"notify_cadence": {"$in": [cadence, None]}}
+    return {"notify_cadence": cadence}
+
+class Notifier:
+    """Fans new events and announcements out to alumni by mail, off the request path.
+
+    Publishing only enqueues a job. A background thread claims jobs under a lease, walks
+    recipients in _id order with a cursor and sends them in rate-limited chunks, saving the
+    last _id after each chunk so a restarted worker picks up where the previous one stopped.
+    Daily/weekly subscribers are skipped here; once per period a digest job is queued for
+    each tenant with news, and it runs under the same lease as instant jobs. Links use the
+    tenant's configured base URL, else the URL the item was published from.
+    """
+
+    def __init__(self, db, users, send_batch, tenant_for, chunk_size=50, per_minute=600,
+                 lease_seconds=300, poll_seconds=5):
+        self.db = db
+        self.users = users
+        self.jobs = db.notify_jobs
+        self.state = db.notify_state
+        self.send_batch = send_batch
+        self.tenant_for = tenant_for
+        self.chunk_size = chunk_size
+        self.per_minute = per_minute
+        self.lease = timedelta(seconds=lease_seconds)
+        self.poll_seconds = poll_seconds
+        self._thread = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self.jobs.create_index([("status", ASCENDING), ("lease_until", ASCENDING)])
+        self.users.create_index([("notify_cadence", ASCENDING), ("_id", ASCENDING)])
+
+    def announce(self, coll, ids, tenant_id=None, base_url=""):
+        """Queues an instant fan-out for items published for the first time; re-publishing is silent."""
+        fresh = [d["_id"] for d in coll.find({"_id": {"$in": list(ids)}, "published": True, "published_at": None},
+                                             {"_id": 1})]
+        if not fresh:
+            return
+        now = datetime.now(timezone.utc)
+        coll.update_many({"_id": {"$in": fresh}}, {"$set": {"published_at": now}})
+        self.jobs.insert_one({"coll": coll.name, "item_ids": fresh, "tenant_id": tenant_id, "status": "queued",
+                              "base_url": base_url.rstrip("/"), "last_user_id": None, "sent": 0, "created_at": now})
+        self.start()
+
+    def start(self):
+        if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+            return
+        with self._lock:
+            if self._thread and self._thread.is_alive() and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._thread = threading.Thread(target=self._run, name="notifier", daemon=True)
+            self._thread.start()
+
+    def _run(self):
+        while True:
+            try:
+                for cadence in DIGEST_PERIODS:
+                    self._queue_digest(cadence)
+                while self._run_one_job():
+                    pass
+            except Exception as e:
+                print("[notify] worker error:", e)
+            time.sleep(self.poll_seconds)
+
+    def _run_one_job(self):
+        now = datetime.now(timezone.utc)
+        token = secrets.token_hex(6)
+        job = self.jobs.find_one_and_update(
+            {"$or": [{"status": "queued"}, {"status": "running", "lease_until": {"$lt": now}}]},
+            {"$set": {"status": "running", "lease_until": now + self.lease, "owner": token}},
+            sort=[("created_at", ASCENDING)],
+            return_document=ReturnDocument.AFTER,
+        )
+        if not job:
+            return False
+        if job.get("digest"):
+            since = {"published": True, "tenant_id": job.get("tenant_id"),
+                     "published_at": {"$gt": job["since"], "$lte": job["until"]}}
+            items = self._items("events", since) + self._items("blogs", since)
+            audience = cadence_filter(job["digest"])
+        else:
+            items = self._items(job["coll"], {"_id": {"$in": job["item_ids"]}, "published": True})
+            audience = cadence_filter("instant")
+        tenant = self.tenant_for(job.get("tenant_id"))
+        base_url = tenant.base_url or job.get("base_url")
+        if items and not base_url:
+            print(f"[notify] no base URL for tenant {job.get('tenant_id')}, skipping job {job['_id']}")
+            items = []
+        if items:
+            subject, body = self._compose(items, tenant, base_url, digest=job.get("digest"))
+            if not self._fan_out({**audience, "tenant_id": job.get("tenant_id")}, subject, body, job, token):
+                print(f"[notify] lost the lease on job {job['_id']}, leaving it to its new owner")
+                return True
+        self.jobs.update_one({"_id": job["_id"], "owner": token},
+                             {"$set": {"status": "done", "finished_at": datetime.now(timezone.utc)}})
+        return True
+
+    def _queue_digest(self, cadence):
+        now = datetime.now(timezone.utc)
+        period = DIGEST_PERIODS[cadence]
+        self.state.update_one({"_id": cadence}, {"$setOnInsert": {"last_run": now}}, upsert=True)
+        prev = self.state.find_one_and_update(
+            {"_id": cadence, "last_run": {"$lte": now - period}},
+            {"$set": {"last_run": now}},
+        )
+        if not prev:
+            return
+        since = {"published": True, "published_at": {"$gt": prev["last_run"], "$lte": now}}
+        tenant_ids = set(self.db.events.distinct("tenant_id", since)) | set(self.db.blogs.distinct("tenant_id", since))
+        if tenant_ids:
+            self.jobs.insert_many([{"coll": None, "digest": cadence, "tenant_id": tenant_id,
+                                    "since": prev["last_run"], "until": now, "status": "queued",
+                                    "base_url": self._last_base_url(tenant_id),
+                                    "last_user_id": None, "sent": 0, "created_at": now}
+                                   for tenant_id in tenant_ids])
+
+    def _last_base_url(self, tenant_id):
+        """Every item in a digest was announced first, so its tenant has an instant job with a base URL."""
+        job = self.jobs.find_one({"tenant_id": tenant_id, "coll": {"$ne": None}, "base_url": {"$nin": [None, ""]}},
+                                 {"base_url": 1}, sort=[("created_at", DESCENDING)])
+        return job["base_url"] if job else ""
+
+    def _fan_out(self, filt, subject, body, job, token):
+        """Returns False if another worker took over the job because our lease lapsed."""
+        last_id = job.get("last_user_id")
+        gap = 60.0 * self.chunk_size / self.per_minute if self.per_minute else 0
+        while True:
+            q = dict(filt)
+            if last_id is not None:
+                q["_id"] = {"$gt": last_id}
+            cur = self.users.find(q, {"personal_email": 1}).sort("_id", ASCENDING).limit(self.chunk_size)
+            chunk = list(cur)
+            if not chunk:
+                return True
+            started = time.monotonic()
+            self.send_batch([(u["personal_email"], subject, body) for u in chunk if u.get("personal_email")])
+            last_id = chunk[-1]["_id"]
+            res = self.jobs.update_one({"_id": job["_id"], "owner": token}, {
+                "$set": {"last_user_id": last_id,
+                         "lease_until": datetime.now(timezone.utc) + self.lease},
+                "$inc": {"sent": len(chunk)},
+            })
+            if not res.matched_count:
+                return False
+            wait = gap - (time.monotonic() - started)
+            if wait > 0:
+                time.sleep(wait)
+
+    def _items(self, coll_name, filt):
+        kind = "event" if coll_name == "events" else "blog"
+        return [(kind, d) for d in self.db[coll_name].find(filt, {"title": 1, "slug": 1, "date": 1, "tenant_id": 1})]
+
+    def _compose(self, items, tenant, base_url, digest=None):
+        lines = []
+        for kind, d in items:
+            when = f" ({d['date'].strftime('%d %b %Y')})" if kind == "event" and d.get("date") else ""
+            lines.append(f"- {d.get('title')}{when}: {base_url}/{kind}/{d.get('slug')}")
+        if digest:
+            subject = f"{tenant.name} – your {digest} digest"
+        elif len(items) == 1:
+            subject = f"{tenant.name} – new {items[0][0]}: {items[0][1].get('title')}"
+        else:
+            subject = f"{tenant.name} – {len(items)} new updates"
+        body = f"New on {tenant.name}:\n\n" + "\n".join(lines) + \
+            "\n\nChange how often you hear from us on your profile page."
+        return subject, body
@@ -0,0 +1,46 @@
+# utils/render.py
+import hashlib
+import html as htmllib
+import re
+import markdown
+import nh3
+
+RENDER_VERSION = 2
+EXCERPT_LEN = 200
+
+_BLOCK_TAG_RE = re.compile(r"</?(?:p|h[1-6]|li|ul|ol|blockquote|pre|table|thead|tbody|tr|th|td|div|br|hr)\b[^>]*>")
+_TAG_RE = re.compile(r"<[^>]+>")
+_WS_RE = re.compile(r"\s+")
+
+ALLOWED_TAGS = {
+    "h1", "h2", "h3", "h4", "h5", "h6", "p", "br", "hr", "blockquote", "pre", "code",
+    "ul", "ol", "li", "strong", "em", "del", "a", "img", "div",
+    "table", "thead", "tbody", "tr", "th", "td",
+}
+ALLOWED_ATTRS = {
+    "*": {"id", "class"},
+    "a": {"href", "title"},
+    "img": {"src", "alt", "title"},
+    "th": {"align"},
+    "td": {"align"},
+}
+
+def render_markdown(text):
+    """Markdown -> sanitized HTML, computed once when a blog is saved.
+
+    Returns the fields stored on the blog document: body_html, toc_html (empty when the post
+    has fewer than two headings), body_hash, which detail views use as their ETag, and a
+    plain-text excerpt for list views.
+    """
+    md = markdown.Markdown(extensions=["toc", "fenced_code", "tables", "sane_lists", "nl2br"])
+    html = nh3.clean(md.convert(text or ""), tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS,
+                     link_rel="noopener noreferrer")
+    heading_count = _count(md.toc_tokens)
+    toc = nh3.clean(md.toc, tags=ALLOWED_TAGS, attributes=ALLOWED_ATTRS) if heading_count >= 2 else ""
+    digest = hashlib.sha256(f"{RENDER_VERSION}\0{html}\0{toc}".encode("utf-8")).hexdigest()[:32]
+    text = _WS_RE.sub(" ", htmllib.unescape(_TAG_RE.sub("", _BLOCK_TAG_RE.sub(" ", html)))).strip()
+    return {"body_html": html, "toc_html": toc, "body_hash": digest, "render_version": RENDER_VERSION,
+            "excerpt": text[:EXCERPT_LEN], "excerpt_truncated": len(text) > EXCERPT_LEN}
+
+def _count(tokens):
+    return sum(1 + _count(t.get("children", [])) for t in tokens)
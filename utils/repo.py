@@ -0,0 +1,87 @@
+# utils/repo.py
+from typing import Optional
+
+class Row:
+    """Compact read-only view of a document; only FIELDS are fetched from Mongo.
+
+    Missing or null fields read as "" (so templates print nothing), except those in DEFAULTS.
+    """
+
+    __slots__ = ("id",)
+    FIELDS: tuple = ()
+    EXTRA: dict = {}
+    DEFAULTS: dict = {"date": None, "created_at": None, "published": False}
+
+    @classmethod
+    def projection(cls) -> dict:
+        proj = {f: 1 for f in cls.FIELDS}
+        proj.update(cls.EXTRA)
+        return proj
+
+    @classmethod
+    def from_doc(cls, doc: dict):
+        row = cls.__new__(cls)
+        row.id = str(doc["_id"])
+        for f in (*cls.FIELDS, *cls.EXTRA):
+            v = doc.get(f)
+            setattr(row, f, cls.DEFAULTS.get(f, "") if v is None else v)
+        return row
+
+class AlumniRow(Row):
+    __slots__ = ("full_name", "graduation_year", "branch", "company", "linkedin")
+    FIELDS = __slots__
+
+class AdminAlumniRow(Row):
+    __slots__ = ("full_name", "college_email", "personal_email", "graduation_year", "branch", "company")
+    FIELDS = __slots__
+
+class ProfileRow(Row):
+    __slots__ = ("full_name", "branch", "graduation_year", "company", "phone", "linkedin", "personal_email",
+                 "notify_cadence")
+    FIELDS = __slots__
+
+class EventRow(Row):
+    __slots__ = ("title", "slug", "description", "date", "venue", "mode", "join_url")
+    FIELDS = __slots__
+
+class AdminEventRow(Row):
+    __slots__ = ("title", "slug", "date", "published")
+    FIELDS = __slots__
+
+class AdminBlogRow(Row):
+    __slots__ = ("title", "slug", "published", "created_at")
+    FIELDS = __slots__
+
+class BlogRow(Row):
+    __slots__ = ("title", "slug", "created_at", "body_html", "toc_html", "body_hash")
+    FIELDS = __slots__
+
+class BlogSummaryRow(Row):
+    """Title plus the plain-text excerpt stored at render time, so list views never transfer full bodies."""
+
+    __slots__ = ("title", "slug", "created_at", "excerpt", "truncated")
+    FIELDS = ("title", "slug", "created_at", "excerpt")
+
+    @classmethod
+    def projection(cls) -> dict:
+        return {**super().projection(), "excerpt_truncated": 1}
+
+    @classmethod
+    def from_doc(cls, doc: dict):
+        row = super().from_doc(doc)
+        row.truncated = bool(doc.get("excerpt_truncated"))
+        return row
+
+def find_rows(coll, row_cls, filt, sort=None, skip=0, limit=0) -> list:
+    cur = coll.find(filt, row_cls.projection())
+    if sort:
+        cur = cur.sort(sort)
+    if skip:
+        cur = cur.skip(skip)
+    if limit:
+        cur = cur.limit(limit)
+    return [row_cls.from_doc(d) for d in cur]
+
+def find_row(coll, row_cls, filt) -> Optional[Row]:
+    doc = coll.find_one(filt, row_cls.projection())
+    return row_cls.from_doc(doc) if doc else None
@@ -0,0 +1,73 @@
+# utils/resilience.py
+import threading
+import time
+
+class Unavailable(Exception):
+    """Raised instead of calling a dependency that is failing or already saturated."""
+
+class Breaker:
+    """Circuit breaker plus bulkhead for one external dependency.
+
+    After `threshold` consecutive failures the circuit opens and calls fail fast for
+    `reset_seconds`; then a single trial call is let through (half-open). At most
+    `max_concurrent` calls run at once, so one slow dependency cannot tie up every worker
+    thread. Only exceptions listed in `errors` count as failures.
+    """
+
+    def __init__(self, name, threshold=5, reset_seconds=30, max_concurrent=4, wait_seconds=0.5,
+                 errors=(Exception,)):
+        self.name = name
+        self.threshold = threshold
+        self.reset_seconds = reset_seconds
+        self.wait_seconds = wait_seconds
+        self.errors = errors
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._lock = threading.Lock()
+        self._failures = 0
+        self._opened_at = None
+        self._trial = False
+
+    @property
+    def state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at >= self.reset_seconds:
+            return "half-open"
+        return "open"
+
+    def call(self, fn, *args, **kwargs):
+        with self._lock:
+            state = self.state
+            if state == "open" or (state == "half-open" and self._trial):
+                raise Unavailable(f"{self.name} circuit open")
+            if state == "half-open":
+                self._trial = True
+        if not self._slots.acquire(timeout=self.wait_seconds):
+            with self._lock:
+                self._trial = False
+            raise Unavailable(f"{self.name} bulkhead full")
+        try:
+            result = fn(*args, **kwargs)
+        except self.errors:
+            self._record(False)
+            raise
+        except BaseException:
+            self._record(True)
+            raise
+        else:
+            self._record(True)
+            return result
+        finally:
+            self._slots.release()
+
+    def _record(self, ok):
+        with self._lock:
+            self._trial = False
+            if ok:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self.threshold:
+                self._opened_at = time.monotonic()
+                print(f"[resilience] {self.name} circuit open after {self._failures} failure(s)")
@@ -0,0 +1,146 @@
+# utils/rsvp.py
+import csv
+import io
+from datetime import datetime, timezone
+from pymongo import ASCENDING, ReturnDocument
+from pymongo.errors import DuplicateKeyError
+
+_FORMULA_PREFIXES = ("=", "+", "-", "@", "\t", "\r")
+
+def _cell(value):
+    """Neutralizes text a spreadsheet would run as a formula."""
+    value = "" if value is None else str(value)
+    return "'" + value if value.startswith(_FORMULA_PREFIXES) else value
+
+class RSVPBook:
+    """Event RSVPs with a waitlist.
+
+    Seat counts live in their own small collection and are only ever changed by a single
+    conditional $inc, so a burst of concurrent RSVPs can never push "going" past capacity.
+    Attendee rows are kept separately, one per (event, user).
+    """
+
+    def __init__(self, db, seats_name="event_seats", attendees_name="event_attendees"):
+        self.seats = db[seats_name]
+        self.attendees = db[attendees_name]
+        self.attendees.create_index([("event_id", ASCENDING), ("user_id", ASCENDING)], unique=True)
+        self.attendees.create_index([("event_id", ASCENDING), ("status", ASCENDING), ("created_at", ASCENDING)])
+
+    def set_capacity(self, event_id, capacity):
+        self.seats.update_one({"_id": event_id},
+                              {"$set": {"capacity": capacity or 0},
+                               "$setOnInsert": {"going": 0, "waitlisted": 0}},
+                              upsert=True)
+
+    def counts(self, event_id):
+        doc = self.seats.find_one({"_id": event_id}) or {}
+        return {"capacity": doc.get("capacity", 0), "going": doc.get("going", 0),
+                "waitlisted": doc.get("waitlisted", 0)}
+
+    def status(self, event_id, user_id):
+        a = self.attendees.find_one({"event_id": event_id, "user_id": user_id}, {"status": 1, "created_at": 1})
+        if not a:
+            return None, None
+        if a["status"] != "waitlisted":
+            return a["status"], None
+        ahead = self.attendees.count_documents({"event_id": event_id, "status": "waitlisted",
+                                                "created_at": {"$lt": a["created_at"]}})
+        return "waitlisted", ahead + 1
+
+    def rsvp(self, event_id, user_id):
+        """Returns "going", "waitlisted", or None if the user already has an RSVP."""
+        try:
+            self.attendees.insert_one({"event_id": event_id, "user_id": user_id, "status": "pending",
+                                       "created_at": datetime.now(timezone.utc)})
+        except DuplicateKeyError:
+            return None
+        self.seats.update_one({"_id": event_id},
+                              {"$setOnInsert": {"capacity": 0, "going": 0, "waitlisted": 0}},
+                              upsert=True)
+        status = "going" if self._claim_seat(event_id) else "waitlisted"
+        if status == "waitlisted":
+            self.seats.update_one({"_id": event_id}, {"$inc": {"waitlisted": 1}})
+        res = self.attendees.update_one({"event_id": event_id, "user_id": user_id, "status": "pending"},
+                                        {"$set": {"status": status}})
+        if not res.matched_count:
+            self.seats.update_one({"_id": event_id}, {"$inc": {status: -1}})
+            if status == "going":
+                self._promote(event_id)
+            return None
+        return status
+
+    def cancel(self, event_id, user_id):
+        a = self.attendees.find_one_and_delete({"event_id": event_id, "user_id": user_id})
+        if not a:
+            return False
+        if a["status"] == "waitlisted":
+            self.seats.update_one({"_id": event_id}, {"$inc": {"waitlisted": -1}})
+        elif a["status"] == "going":
+            self.seats.update_one({"_id": event_id}, {"$inc": {"going": -1}})
+            self._promote(event_id)
+        return True
+
+    def _claim_seat(self, event_id):
+        doc = self.seats.find_one_and_update(
+            {"_id": event_id, "$or": [{"capacity": {"$lte": 0}}, {"$expr": {"$lt": ["$going", "$capacity"]}}]},
+            {"$inc": {"going": 1}},
+            return_document=ReturnDocument.AFTER,
+        )
+        return doc is not None
+
+    def _promote(self, event_id):
+        while self._claim_seat(event_id):
+            nxt = self.attendees.find_one_and_update(
+                {"event_id": event_id, "status": "waitlisted"},
+                {"$set": {"status": "going"}},
+                sort=[("created_at", ASCENDING)],
+            )
+            if not nxt:
+                self.seats.update_one({"_id": event_id}, {"$inc": {"going": -1}})
+                return
+            self.seats.update_one({"_id": event_id}, {"$inc": {"waitlisted": -1}})
+
+    def delete_events(self, event_ids):
+        self.seats.delete_many({"_id": {"$in": event_ids}})
+        self.attendees.delete_many({"event_id": {"$in": event_ids}})
+
+    def delete_users(self, user_ids):
+        """Cancels every RSVP of deleted users, handing their seats to the waitlist."""
+        for a in self.attendees.find({"user_id": {"$in": list(user_ids)}}, {"event_id": 1, "user_id": 1}):
+            self.cancel(a["event_id"], a["user_id"])
+
+    def export_csv(self, event_id, users, chunk=500):
+        """Yields CSV lines for an event's attendees, joining user details a chunk at a time."""
+        buf = io.StringIO()
+        w = csv.writer(buf)
+
+        def flush():
+            out = buf.getvalue()
+            buf.seek(0)
+            buf.truncate(0)
+            return out
+
+        w.writerow(["status", "rsvp_at", "full_name", "personal_email", "graduation_year", "branch", "company"])
+        yield flush()
+        cur = self.attendees.find({"event_id": event_id}, {"user_id": 1, "status": 1, "created_at": 1}) \
+            .sort([("status", ASCENDING), ("created_at", ASCENDING)]).batch_size(chunk)
+        batch = []
+        for a in cur:
+            batch.append(a)
+            if len(batch) >= chunk:
+                yield from self._rows(w, flush, batch, users)
+                batch = []
+        if batch:
+            yield from self._rows(w, flush, batch, users)
+
+    def _rows(self, w, flush, batch, users):
+        ids = [a["user_id"] for a in batch]
+        info = {u["_id"]: u for u in users.find(
+            {"_id": {"$in": ids}},
+            {"full_name": 1, "personal_email": 1, "graduation_year": 1, "branch": 1, "company": 1})}
+        for a in batch:
+            u = info.get(a["user_id"], {})
+            w.writerow([a.get("status"), a["created_at"].isoformat() if a.get("created_at") else "",
+                        _cell(u.get("full_name")), _cell(u.get("personal_email")), u.get("graduation_year") or "",
+                        _cell(u.get("branch")), _cell(u.get("company"))])
+        yield flush()
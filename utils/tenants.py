@@ -0,0 +1,170 @@
+# utils/tenants.py
+import threading
+import time
+from pymongo import ASCENDING, DESCENDING
+from werkzeug.security import check_password_hash
+
+class Tenant:
+    __slots__ = ("id", "name", "hosts", "base_url", "email_domain", "open_registration", "notify_email",
+                 "_admin_password", "_admin_password_hash")
+
+    def __init__(self, id, name, hosts=(), base_url="", email_domain="", notify_email="", admin_password=None,
+                 admin_password_hash=None, open_registration=False):
+        self.id = id
+        self.name = name
+        self.hosts = tuple(h.lower() for h in hosts)
+        self.base_url = (base_url or "").rstrip("/")
+        self.email_domain = (email_domain or "").lower()
+        self.open_registration = open_registration
+        self.notify_email = notify_email
+        self._admin_password = admin_password
+        self._admin_password_hash = admin_password_hash
+
+    @classmethod
+    def from_doc(cls, doc):
+        """Nothing is inherited from the default tenant.
+
+        Registration is closed unless the document sets an email_domain or `open_registration: true`.
+        """
+        hosts = doc.get("hosts") or ()
+        return cls(doc["_id"], doc.get("name") or str(doc["_id"]), hosts,
+                   doc.get("base_url") or (f"https://{hosts[0]}" if hosts else ""),
+                   doc.get("email_domain") or "",
+                   doc.get("notify_email") or "",
+                   admin_password_hash=doc.get("admin_password_hash"),
+                   open_registration=doc.get("open_registration") is True)
+
+    def accepts_registration(self, college_email):
+        if self.email_domain:
+            return college_email.endswith(self.email_domain)
+        return self.open_registration
+
+    def check_admin_password(self, pw):
+        if self._admin_password_hash:
+            return check_password_hash(self._admin_password_hash, pw)
+        return bool(self._admin_password) and pw == self._admin_password
+
+class TenantRegistry:
+    """Resolves the request host to a tenant.
+
+    Tenants are documents in the shared `tenants` collection, reloaded every `ttl` seconds.
+    Hosts no tenant claims fall back to the default tenant built from the environment, so a
+    single-college deployment keeps working without any tenant documents.
+    """
+
+    def __init__(self, coll, default, ttl=60):
+        self.coll = coll
+        self.default = default
+        self.ttl = ttl
+        self._by_host = {}
+        self._by_id = {}
+        self._loaded_at = 0
+        self._lock = threading.Lock()
+        self.coll.create_index("hosts")
+
+    def resolve(self, host):
+        self._refresh()
+        host = (host or "").split(":")[0].lower()
+        return self._by_host.get(host, self.default)
+
+    def get(self, tenant_id):
+        self._refresh()
+        return self._by_id.get(tenant_id, self.default)
+
+    def _refresh(self):
+        if time.monotonic() - self._loaded_at < self.ttl:
+            return
+        with self._lock:
+            if time.monotonic() - self._loaded_at < self.ttl:
+                return
+            by_host, by_id = {}, {self.default.id: self.default}
+            try:
+                for doc in self.coll.find({}):
+                    t = Tenant.from_doc(doc)
+                    by_id[t.id] = t
+                    for h in t.hosts:
+                        by_host[h] = t
+            except Exception as e:
+                print("[tenants] reload failed, keeping previous map:", e)
+                self._loaded_at = time.monotonic()
+                return
+            self._by_host, self._by_id = by_host, by_id
+            self._loaded_at = time.monotonic()
+
+class TenantCollection:
+    """A collection whose filters and inserts are pinned to the current tenant.
+
+    `tenant_id` is a callable (normally reading the request's tenant) so one module-level
+    handle serves every tenant over the shared client and connection pool. `on_write`, if
+    given, is called after every write that returned without error.
+    """
+
+    def __init__(self, coll, tenant_id, on_write=None):
+        self.raw = coll
+        self.tenant_id = tenant_id
+        self.on_write = on_write
+
+    def _wrote(self, result):
+        if self.on_write:
+            self.on_write()
+        return result
+
+    @property
+    def name(self):
+        return self.raw.name
+
+    def _f(self, filt=None):
+        return {**(filt or {}), "tenant_id": self.tenant_id()}
+
+    def find(self, filt=None, *args, **kwargs):
+        return self.raw.find(self._f(filt), *args, **kwargs)
+
+    def find_one(self, filt=None, *args, **kwargs):
+        return self.raw.find_one(self._f(filt), *args, **kwargs)
+
+    def count_documents(self, filt, **kwargs):
+        return self.raw.count_documents(self._f(filt), **kwargs)
+
+    def insert_one(self, doc, **kwargs):
+        return self._wrote(self.raw.insert_one({**doc, "tenant_id": self.tenant_id()}, **kwargs))
+
+    def update_one(self, filt, update, **kwargs):
+        return self._wrote(self.raw.update_one(self._f(filt), update, **kwargs))
+
+    def update_many(self, filt, update, **kwargs):
+        return self._wrote(self.raw.update_many(self._f(filt), update, **kwargs))
+
+    def delete_one(self, filt, **kwargs):
+        return self._wrote(self.raw.delete_one(self._f(filt), **kwargs))
+
+    def delete_many(self, filt, **kwargs):
+        return self._wrote(self.raw.delete_many(self._f(filt), **kwargs))
+
+    def find_one_and_update(self, filt, update, **kwargs):
+        return self._wrote(self.raw.find_one_and_update(self._f(filt), update, **kwargs))
+
+    def find_one_and_delete(self, filt, **kwargs):
+        return self._wrote(self.raw.find_one_and_delete(self._f(filt), **kwargs))
+
+def ensure_indexes(db):
+    db.users.create_index([("tenant_id", ASCENDING), ("personal_email", ASCENDING)])
+    db.users.create_index([("tenant_id", ASCENDING), ("college_email", ASCENDING)])
+    db.users.create_index([("tenant_id", ASCENDING), ("graduation_year", DESCENDING), ("full_name", ASCENDING)])
+    db.users.create_index([("tenant_id", ASCENDING), ("created_at", DESCENDING)])
+    db.users.create_index([("tenant_id", ASCENDING), ("notify_cadence", ASCENDING), ("_id", ASCENDING)])
+    db.events.create_index([("tenant_id", ASCENDING), ("published", ASCENDING), ("date", ASCENDING)])
+    db.events.create_index([("tenant_id", ASCENDING), ("slug", ASCENDING)])
+    db.blogs.create_index([("tenant_id", ASCENDING), ("published", ASCENDING), ("created_at", DESCENDING)])
+    db.blogs.create_index([("tenant_id", ASCENDING), ("slug", ASCENDING)])
+    db.contacts.create_index([("tenant_id", ASCENDING), ("status", ASCENDING), ("created_at", DESCENDING)])
+    db.otps.create_index([("tenant_id", ASCENDING), ("college_email", ASCENDING)])
+    db.resets.create_index([("tenant_id", ASCENDING), ("email", ASCENDING)])
+    db.email_changes.create_index([("tenant_id", ASCENDING), ("user_id", ASCENDING), ("new_email", ASCENDING)])
+
+TENANT_SCOPED = ("users", "events", "blogs", "otps", "resets", "email_changes", "contacts")
+
+def assign_missing(db, tenant_id):
+    """Tags documents created before multi-tenancy with `tenant_id`. Idempotent; the app runs it on every start."""
+    return {name: db[name].update_many({"tenant_id": {"$exists": False}},
+                                       {"$set": {"tenant_id": tenant_id}}).modified_count
+            for name in TENANT_SCOPED}